@@ -6,6 +6,7 @@ from datetime import datetime
 class Message:
     role: str  # "user" or "assistant"
     content: str
+    seq: int | None = None  # Position in the chat, None until saved
 
     def to_dict(self) -> dict:
         return {"role": self.role, "content": self.content}
@@ -35,3 +36,24 @@ class Chat:
 
         now = datetime.now()
         return Chat(id=None, title=title, messages=[], created_at=now, updated_at=now)
+
+
+@dataclass
+class ChatSummary:
+    """A chat's metadata without its messages, for listing chats"""
+
+    id: int
+    title: str
+    updated_at: datetime
+
+
+@dataclass
+class Document:
+    """A document in the catalog, for listing documents without their chunks"""
+
+    file_path: str
+    file_name: str
+    file_hash: str
+    chunk_count: int
+    size: int | None  # In bytes, None if added before sizes were recorded
+    ingested_at: datetime | None  # None if added before ingest times were recorded
@@ -1,4 +1,7 @@
-import ollama
+import threading
+from functools import partial
+from typing import TYPE_CHECKING
+
 from textual import on, work
 from textual.app import App, ComposeResult
 from textual.containers import Horizontal, Vertical, VerticalScroll
@@ -7,19 +10,46 @@ from textual.widgets import (
     Header,
     Input,
     Label,
-    ListView,
+    OptionList,
     Static,
     Switch,
 )
 
-from open_terminalui._models import Chat, Message
+from open_terminalui._models import Chat, ChatSummary, Message
 from open_terminalui._themes import open_terminalui_theme
 from open_terminalui.chat_manager import ChatManager
-from open_terminalui.components import ChatListItem, ChatMessage
-from open_terminalui.document_manager import DocumentManager
-from open_terminalui.memory_manager import MemoryManager
+from open_terminalui.components import (
+    ChatList,
+    ChatMessage,
+    StreamingChatMessage,
+)
+from open_terminalui.context_builder import (
+    ContextBuilder,
+    PromptStats,
+    prompt_layout_from_env,
+    prompt_stats_path,
+    summarize_prompt_stats,
+)
+from open_terminalui.memory_indexer import MemoryIndexer
+from open_terminalui.ollama_client import (
+    OllamaClient,
+    OllamaSettings,
+    get_ollama_client,
+)
 from open_terminalui.screens.document_screen import DocumentManagerScreen
-from open_terminalui.tools import document_search, memory_search, web_search
+from open_terminalui.startup_timer import StartupTimer, startup_report_path
+from open_terminalui.stream_renderer import StreamRenderer
+from open_terminalui.tools import (
+    Retriever,
+    document_search_blocks,
+    memory_search_blocks,
+    run_retrievers,
+    web_search_blocks,
+)
+
+if TYPE_CHECKING:
+    from open_terminalui.document_manager import DocumentManager
+    from open_terminalui.memory_manager import MemoryManager
 
 
 class OpenTerminalUI(App):
@@ -30,23 +60,112 @@ class OpenTerminalUI(App):
         ("ctrl+d", "delete_chat", "Delete Chat"),
         ("ctrl+k", "manage_documents", "Manage Documents"),
     ]
-
-    def __init__(self, *args, **kwargs):
+    # Seconds each retriever may take before its results are skipped for the turn
+    RETRIEVAL_TIMEOUTS = {
+        "web_search": 10.0,
+        "document_search": 5.0,
+        "memory_search": 5.0,
+    }
+    # Messages loaded when a chat is opened, and per page when scrolling up
+    MESSAGE_PAGE_SIZE = 50
+    # Once the user is back at the bottom, older messages beyond this are unloaded
+    MAX_LOADED_MESSAGES = 200
+    LOG_ROLES = ("web_search", "document_search", "memory_search")
+
+    def __init__(
+        self,
+        *args,
+        stream_flush_interval: float = 1 / 30,
+        prompt_layout: str | None = None,
+        ollama_settings: OllamaSettings | None = None,
+        warm_up: bool | None = None,
+        startup_timer: StartupTimer | None = None,
+        **kwargs,
+    ):
+        """
+        Initialize the app.
+
+        Args:
+            stream_flush_interval: Minimum number of seconds between UI updates while
+                                  streaming a response (default: 1/30)
+            prompt_layout: Where retrieval context goes in the prompt, one of
+                          PROMPT_LAYOUTS. If None, reads it from the environment.
+                          See prompt_layout_from_env.
+            ollama_settings: Ollama host, model and runtime settings. If None, uses
+                            the shared client configured from the environment.
+            warm_up: Whether to preload the models in the background, the chat
+                    models on startup and the embedding model once memory or
+                    documents are turned on. If None, uses the Ollama settings.
+            startup_timer: Timer started when the process launched. If None, startup
+                          phases are timed from here.
+        """
         super().__init__(*args, **kwargs)
+        self.startup_timer = startup_timer or StartupTimer()
+        self.stream_flush_interval = stream_flush_interval
+        self.prompt_layout = prompt_layout or prompt_layout_from_env()
+        if ollama_settings is None:
+            self.ollama_client = get_ollama_client()
+        else:
+            self.ollama_client = OllamaClient(ollama_settings)
+        self.context_builder = ContextBuilder(
+            max_tokens=self.ollama_client.settings.num_ctx,
+            layout=self.prompt_layout,
+            summarizer=self._summarize_history,
+        )
+        self.prompt_stats: list[PromptStats] = []
+        self.prompt_stats_path = prompt_stats_path()
+        self.warm_up_enabled = (
+            warm_up if warm_up is not None else self.ollama_client.settings.warm_up
+        )
+        self.generating = False
         self.chat_history = []
         self.current_assistant_message: ChatMessage
         self.chat_manager = ChatManager()
-        self.doc_manager = DocumentManager()
-        self.memory_manager = MemoryManager()
+        self.memory_indexer = MemoryIndexer(
+            self.chat_manager, lambda: self.memory_manager
+        )
+        # The vector stores are opened on first use, see doc_manager/memory_manager
+        self._doc_manager: "DocumentManager | None" = None
+        self._memory_manager: "MemoryManager | None" = None
+        self._managers_lock = threading.Lock()
         self.current_chat: Chat
+        self._loading_older_messages = False
         self.sidebar_visible = True
+        self.startup_timer.mark("app_init")
+
+    @property
+    def doc_manager(self) -> "DocumentManager":
+        """The document manager, imported and opened on first use"""
+        with self._managers_lock:
+            if self._doc_manager is None:
+                from open_terminalui.document_manager import DocumentManager
+
+                self._doc_manager = DocumentManager()
+                elapsed = self.startup_timer.mark("doc_manager")
+                self.log.info(f"Document store ready at {elapsed:.3f}s")
+            return self._doc_manager
+
+    @property
+    def memory_manager(self) -> "MemoryManager":
+        """The memory manager, imported and opened on first use"""
+        with self._managers_lock:
+            if self._memory_manager is None:
+                from open_terminalui.memory_manager import MemoryManager
+
+                self._memory_manager = MemoryManager(ollama_client=self.ollama_client)
+                elapsed = self.startup_timer.mark("memory_manager")
+                self.log.info(f"Memory store ready at {elapsed:.3f}s")
+            return self._memory_manager
 
     def compose(self) -> ComposeResult:
         yield Header()
         with Horizontal(id="main_container"):
             with Vertical(id="sidebar"):
                 yield Label("Chat History", id="sidebar_title")
-                yield ListView(id="chat_list")
+                yield Input(
+                    type="text", id="chat_search", placeholder="Search chats..."
+                )
+                yield ChatList(self._load_chat_page, id="chat_list")
             with Vertical(id="container"):
                 with VerticalScroll(id="chat_container"):
                     pass  # Messages will be added dynamically
@@ -74,8 +193,83 @@ class OpenTerminalUI(App):
         """Initialize a new chat on startup"""
         self.register_theme(open_terminalui_theme)
         self.theme = "open_terminalui"
-        self._refresh_chat_list()
+        self.query_one("#chat_list", ChatList).reload()
         self._new_chat()
+        self.watch(
+            self.query_one("#chat_container", VerticalScroll),
+            "scroll_y",
+            self._on_chat_scroll,
+            init=False,
+        )
+
+        # Defer everything else until the first frame is on screen
+        self.call_after_refresh(self._after_first_paint)
+
+    def on_unmount(self) -> None:
+        """Stop background work and save the startup report if enabled"""
+        self.memory_indexer.stop()
+        self.chat_manager.close()
+
+        report_path = startup_report_path()
+        if report_path is not None:
+            self.startup_timer.save(report_path or None)
+
+    @work(thread=True, group="warm_up")
+    def warm_up_models(self) -> None:
+        """Preload the chat and summary models in the background"""
+        settings = self.ollama_client.settings
+        steps = [
+            (
+                f"Loading {settings.model}...",
+                partial(self.ollama_client.warm_up, settings.model),
+            )
+        ]
+        if self.ollama_client.summary_model != settings.model:
+            steps.append(
+                (
+                    f"Loading {self.ollama_client.summary_model}...",
+                    partial(
+                        self.ollama_client.warm_up, self.ollama_client.summary_model
+                    ),
+                )
+            )
+
+        for status, step in steps:
+            self.call_from_thread(self._show_warm_up_status, status)
+            try:
+                step()
+            except Exception as e:
+                # The first real request will surface the problem to the user
+                self.log.warning(f"Warm-up failed: {e}")
+
+        self.call_from_thread(self._show_warm_up_status, " ")
+        elapsed = self.startup_timer.mark("warm_up")
+        self.log.info(f"Warm-up done at {elapsed:.3f}s")
+
+    @work(thread=True, group="warm_up_store")
+    def warm_up_store(self, store: str) -> None:
+        """
+        Open a store and load the embedding model in the background.
+
+        Done once the store is turned on, so the first search doesn't spend its
+        timeout on it.
+
+        Args:
+            store: "memory" or "documents"
+        """
+        status = (
+            "Loading chat memory..." if store == "memory" else "Opening documents..."
+        )
+        self.call_from_thread(self._show_warm_up_status, status)
+        try:
+            if store == "memory":
+                self.memory_manager.warm_up()
+            else:
+                self.doc_manager.warm_up()
+        except Exception as e:
+            # The first real search will surface the problem to the user
+            self.log.warning(f"Warm-up failed: {e}")
+        self.call_from_thread(self._show_warm_up_status, " ")
 
     @work(exclusive=True, thread=True)
     def stream_ollama_response(
@@ -89,188 +283,303 @@ class OpenTerminalUI(App):
         # Select and update loading indicator
         loading_indicator = self.query_one("#loading_indicator", Static)
 
-        # If search is enabled, perform web search first
-        messages_to_send = self.chat_history.copy()
-        web_search_results = None
+        # Collect the enabled retrievers in a fixed order
+        retrievers = []
         if use_search:
-            self.call_from_thread(loading_indicator.update, "Searching the web...")
-            web_search_results = web_search(query=content)
-
-            # Add search results as system context
-            messages_to_send = [
-                {
-                    "role": "system",
-                    "content": f"Use the following web search results to help answer the user's question:\n\n{web_search_results}",
-                }
-            ] + messages_to_send
-
-            # Always save logs to database
-            log_message_data = Message(role="web_search", content=web_search_results)
-            self.current_chat.messages.append(log_message_data)
-
-            # Only display in UI if logs switch is enabled
-            if use_logs:
-                chat_container = self.query_one("#chat_container", VerticalScroll)
-                log_message = ChatMessage(web_search_results, "web_search")
-                self.call_from_thread(chat_container.mount, log_message)
-                self.call_from_thread(chat_container.scroll_end, animate=False)
-
-        # If documents is enabled, perform vector search
-        document_search_results = None
-        if use_documents:
-            self.call_from_thread(
-                loading_indicator.update, "Searching vector database..."
-            )
-            document_search_results = document_search(
-                doc_manager=self.doc_manager, query=content
+            retrievers.append(
+                Retriever(
+                    role="web_search",
+                    label="the web",
+                    context_prompt="Use the following web search results to help answer the user's question:",
+                    search=partial(web_search_blocks, query=content),
+                    timeout=self.RETRIEVAL_TIMEOUTS["web_search"],
+                )
             )
-
-            # Add search results as system context
-            messages_to_send = [
-                {
-                    "role": "system",
-                    "content": f"Use the following vector search results to help answer the user's question:\n\n{document_search_results}",
-                }
-            ] + messages_to_send
-
-            # Always save logs to database
-            log_message_data = Message(
-                role="document_search", content=document_search_results
+        if use_documents:
+            retrievers.append(
+                Retriever(
+                    role="document_search",
+                    label="vector database",
+                    context_prompt="Use the following vector search results to help answer the user's question:",
+                    search=partial(
+                        document_search_blocks,
+                        doc_manager=self.doc_manager,
+                        query=content,
+                    ),
+                    timeout=self.RETRIEVAL_TIMEOUTS["document_search"],
+                )
             )
-            self.current_chat.messages.append(log_message_data)
-
-            # Only display in UI if logs switch is enabled
-            if use_logs:
-                chat_container = self.query_one("#chat_container", VerticalScroll)
-                log_message = ChatMessage(document_search_results, "document_search")
-                self.call_from_thread(chat_container.mount, log_message)
-                self.call_from_thread(chat_container.scroll_end, animate=False)
-
-        # If memory is enabled, perform memory search
-        memory_search_results = None
         if use_memory:
-            self.call_from_thread(loading_indicator.update, "Searching chat memory...")
-            memory_search_results = memory_search(
-                memory_manager=self.memory_manager, query=content
+            retrievers.append(
+                Retriever(
+                    role="memory_search",
+                    label="chat memory",
+                    context_prompt="Use the following chat summaries from other messages to help answer the user's question:",
+                    search=partial(
+                        memory_search_blocks,
+                        memory_manager=self.memory_manager,
+                        query=content,
+                    ),
+                    timeout=self.RETRIEVAL_TIMEOUTS["memory_search"],
+                )
             )
 
-            # Add search results as system context
-            messages_to_send = [
-                {
-                    "role": "system",
-                    "content": f"Use the following chat summaries from other messages to help answer the user's question:\n\n{memory_search_results}",
-                }
-            ] + messages_to_send
+        # Run all enabled retrievers concurrently
+        if retrievers:
+            labels = ", ".join(retriever.label for retriever in retrievers)
+            self.call_from_thread(loading_indicator.update, f"Searching {labels}...")
+        results = run_retrievers(retrievers)
+
+        # Add search results as system context, keeping the request within budget
+        messages_to_send, usage = self.context_builder.build(self.chat_history, results)
+        self.log.info(str(usage))
 
+        chat_container = self.query_one("#chat_container", VerticalScroll)
+        for result in results:
             # Always save logs to database
-            log_message_data = Message(
-                role="memory_search", content=memory_search_results
-            )
+            log_message_data = Message(role=result.role, content=result.content)
             self.current_chat.messages.append(log_message_data)
 
             # Only display in UI if logs switch is enabled
             if use_logs:
-                chat_container = self.query_one("#chat_container", VerticalScroll)
-                log_message = ChatMessage(memory_search_results, "memory_search")
+                log_message = ChatMessage(result.content, result.role)
                 self.call_from_thread(chat_container.mount, log_message)
                 self.call_from_thread(chat_container.scroll_end, animate=False)
 
         self.call_from_thread(loading_indicator.update, "Thinking...")
 
-        # Select chat history widget
-        chat_container = self.query_one("#chat_container", VerticalScroll)
-
         # Stream ollama response
-        stream = ollama.chat(model="llama3.2", messages=messages_to_send, stream=True)
-        accumulated_text = ""
-
-        for i, chunk in enumerate(stream):
-            accumulated_text += chunk["message"]["content"]
+        stream = self.ollama_client.chat(messages_to_send, stream=True)
+        renderer: StreamRenderer | None = None
 
+        for chunk in stream:
             # Create assistant message widget on first chunk
-            if i == 0:
-                self.chat_history.append(
-                    {"role": "assistant", "content": accumulated_text}
-                )
-                assistant_message = Message(role="assistant", content=accumulated_text)
-                self.current_chat.messages.append(assistant_message)
-
-                self.current_assistant_message = ChatMessage(
-                    accumulated_text, "assistant"
-                )
+            if renderer is None:
+                self.current_assistant_message = StreamingChatMessage("", "assistant")
                 self.call_from_thread(
                     chat_container.mount, self.current_assistant_message
                 )
                 self.call_from_thread(loading_indicator.update, " ")
-            # Update existing assistant message
-            else:
-                self.chat_history[-1]["content"] = accumulated_text
-                self.current_chat.messages[-1].content = accumulated_text
-                self.call_from_thread(
-                    self.current_assistant_message.update_content, accumulated_text
+                renderer = StreamRenderer(
+                    self.current_assistant_message,
+                    flush_interval=self.stream_flush_interval,
                 )
 
-            # Auto-scroll to bottom
-            self.call_from_thread(chat_container.scroll_end, animate=False)
+            # Buffer the token, flushing to the widget at most once per interval
+            renderer.write(chunk["message"]["content"])
+
+            # The final chunk carries the timing stats for the request
+            if chunk.get("done"):
+                stats = PromptStats.from_response(self.prompt_layout, chunk)
+                self.prompt_stats.append(stats)
+                self.log.info(str(stats))
+                if self.prompt_stats_path is not None:
+                    stats.save(self.prompt_stats_path or None)
+                self.log.info(
+                    "Prompt eval averages by layout:",
+                    summarize_prompt_stats(self.prompt_stats),
+                )
+
+        if renderer is not None:
+            renderer.flush()
+            accumulated_text = renderer.text
+
+            self.chat_history.append({"role": "assistant", "content": accumulated_text})
+            assistant_message = Message(role="assistant", content=accumulated_text)
+            self.current_chat.messages.append(assistant_message)
+
+        self.generating = False
+        self.memory_indexer.resume()
 
         # Save chat to database after streaming completes
         self.chat_manager.save_chat(self.current_chat)
 
-        # Save chat to vector database too
-        self.memory_manager.save_chat(self.current_chat)
+        self.call_from_thread(self._unload_old_messages)
+
+        # Index the chat into memory in the background
+        if self.current_chat.id is not None:
+            if not self.memory_indexer.enqueue(self.current_chat.id):
+                # The chat is indexed the next time it's saved with room in the queue
+                self.log.warning(
+                    f"Memory queue is full, chat {self.current_chat.id} wasn't "
+                    "scheduled for indexing"
+                )
+
+        # Move the chat to the top of the sidebar
+        if self.current_chat.id is not None:
+            summary = ChatSummary(
+                id=self.current_chat.id,
+                title=self.current_chat.title,
+                updated_at=self.current_chat.updated_at,
+            )
+            self.call_from_thread(
+                self.query_one("#chat_list", ChatList).upsert_chat, summary
+            )
 
-        # Refresh sidebar to update chat title/timestamp
-        self.call_from_thread(self._refresh_chat_list)
+    @work(thread=True, group="open_documents")
+    def open_document_manager(self) -> None:
+        """Open the document store in the background, then show the document screen"""
+        self.call_from_thread(self._show_warm_up_status, "Opening documents...")
+        doc_manager = self.doc_manager
+        self.call_from_thread(self._show_warm_up_status, " ")
+        self.call_from_thread(self.push_screen, DocumentManagerScreen(doc_manager))
+
+    @work(thread=True)
+    def delete_chat_memory(self, chat_id: int) -> None:
+        """Delete a chat's memory summaries without blocking the UI"""
+        self.memory_manager.delete_chat(chat_id)
 
     # ---------- Private Methods ----------
-    def _refresh_chat_list(self) -> None:
-        """Refresh the sidebar chat list"""
-        chat_list = self.query_one("#chat_list", ListView)
-        chat_list.clear()
+    def _after_first_paint(self) -> None:
+        """Log the startup timings and start background work"""
+        self.startup_timer.mark("first_paint")
+        self.log.info(f"Startup: {self.startup_timer.report()}")
+
+        if self.warm_up_enabled:
+            self.warm_up_models()
+
+        self.memory_indexer.start()
+
+    def _summarize_history(self, messages: list[dict]) -> str:
+        """Condense turns that no longer fit in the prompt, for the context builder"""
+        transcript = "\n\n".join(
+            f"{message['role']}: {message['content']}" for message in messages
+        )
+        prompt = f"""Summarize this conversation so it can be continued without it. Keep the facts, names, decisions and open questions:
+
+{transcript}
+
+Provide only the summary without labels:
+"""
+
+        response = self.ollama_client.summarize([{"role": "user", "content": prompt}])
+        return response.message.content or ""
+
+    def _show_warm_up_status(self, status: str) -> None:
+        """Show warm-up progress unless a response is being generated"""
+        if not self.generating:
+            self.query_one("#loading_indicator", Static).update(status)
 
-        chats = self.chat_manager.list_chats()
-        for chat in chats:
-            if chat.id is not None:
-                chat_list.append(ChatListItem(chat.id, chat.title))
+    def _load_chat_page(
+        self, limit: int, after: ChatSummary | None
+    ) -> list[ChatSummary]:
+        """Load a page of sidebar chats"""
+        return self.chat_manager.list_chat_summaries(limit=limit, after=after)
 
     def _new_chat(self) -> None:
         """Create a new chat and clear the UI (not saved to DB until it has messages)"""
         self.current_chat = Chat.create_unsaved()
         self.chat_history = []
+        self.context_builder.reset()
 
         # Clear chat container
         chat_container = self.query_one("#chat_container", VerticalScroll)
         chat_container.remove_children()
 
     def _load_chat(self, chat_id: int) -> None:
-        """Load an existing chat"""
+        """Load an existing chat, showing only its most recent messages"""
         chat = self.chat_manager.load_chat(chat_id)
         if chat is None:
             return
 
-        self.current_chat = chat
+        # The whole conversation goes to the context builder, which compacts what
+        # doesn't fit the prompt budget. Only the last page is shown.
         self.chat_history = chat.to_ollama_messages()
+        self.context_builder.reset()
+        chat.messages = chat.messages[-self.MESSAGE_PAGE_SIZE :]
+        self.current_chat = chat
 
         # Clear and reload chat messages in UI
         chat_container = self.query_one("#chat_container", VerticalScroll)
         chat_container.remove_children()
+        chat_container.mount_all(self._make_message_widgets(chat.messages))
+        chat_container.scroll_end(animate=False)
 
-        # Check if logs should be displayed
-        logs_switch = self.query_one("#logs_switch", Switch)
-        show_logs = logs_switch.value
+    def _shown_messages(self, messages: list[Message]) -> list[Message]:
+        """The messages that get a widget, skipping log messages if logs are hidden"""
+        show_logs = self.query_one("#logs_switch", Switch).value
+        return [
+            message
+            for message in messages
+            if show_logs or message.role not in self.LOG_ROLES
+        ]
+
+    def _make_message_widgets(self, messages: list[Message]) -> list[ChatMessage]:
+        """Create widgets for the messages that are shown"""
+        return [
+            ChatMessage(message.content, message.role)
+            for message in self._shown_messages(messages)
+        ]
+
+    def _on_chat_scroll(self, scroll_y: float) -> None:
+        """Load older messages when the user scrolls near the top of the chat"""
+        chat_container = self.query_one("#chat_container", VerticalScroll)
+        if scroll_y < chat_container.scrollable_content_region.height:
+            self._load_older_messages()
 
-        for message in chat.messages:
-            # Skip log messages if logs switch is off
-            if (
-                message.role in ("web_search", "document_search", "memory_search")
-                and not show_logs
-            ):
-                continue
+    def _load_older_messages(self) -> None:
+        """Mount the previous page of messages above the loaded ones"""
+        if self._loading_older_messages or self.current_chat.id is None:
+            return
 
-            msg_widget = ChatMessage(message.content, message.role)
-            chat_container.mount(msg_widget)
+        chat_container = self.query_one("#chat_container", VerticalScroll)
+        widgets: list[ChatMessage] = []
+
+        # Keep going if a page is all hidden log messages
+        while not widgets:
+            messages = self.current_chat.messages
+            # Stop at the start of the chat, or if nothing has been saved yet
+            if not messages or messages[0].seq in (None, 0):
+                return
+
+            older = self.chat_manager.load_messages(
+                self.current_chat.id,
+                before_seq=messages[0].seq,
+                limit=self.MESSAGE_PAGE_SIZE,
+            )
+            if not older:
+                return
+
+            messages[:0] = older
+            widgets = self._make_message_widgets(older)
+
+        self._loading_older_messages = True
+        previous_height = chat_container.virtual_size.height
+        if chat_container.children:
+            chat_container.mount_all(widgets, before=0)
+        else:
+            chat_container.mount_all(widgets)
+
+        def keep_scroll_position() -> None:
+            # Keep the same messages in view now that there is more content above
+            added_height = chat_container.virtual_size.height - previous_height
+            chat_container.scroll_to(
+                y=chat_container.scroll_y + added_height, animate=False
+            )
+            self._loading_older_messages = False
 
-        chat_container.scroll_end(animate=False)
+        self.call_after_refresh(keep_scroll_position)
+
+    def _unload_old_messages(self) -> None:
+        """Unmount messages far above the view once the user is back at the bottom"""
+        chat_container = self.query_one("#chat_container", VerticalScroll)
+        messages = self.current_chat.messages
+
+        excess = len(messages) - self.MAX_LOADED_MESSAGES
+        if excess <= 0 or chat_container.scroll_y < chat_container.max_scroll_y:
+            return
+
+        # Only saved messages can be loaded again later
+        unloaded = messages[:excess]
+        if any(message.seq is None for message in unloaded):
+            return
+        del messages[:excess]
+
+        # Widgets are in the same order as the messages they show
+        widget_count = len(self._shown_messages(unloaded))
+        chat_container.remove_children(
+            list(chat_container.query_children(ChatMessage))[:widget_count]
+        )
 
     # ---------- Handlers ----------
 
@@ -304,15 +613,42 @@ class OpenTerminalUI(App):
         chat_container.scroll_end(animate=False)
 
         input_widget.clear()
+        self.generating = True
+        self.memory_indexer.pause()
         self.stream_ollama_response(
             content, use_search, use_logs, use_documents, use_memory
         )
 
-    @on(ListView.Selected, "#chat_list")
-    def handle_chat_selection(self, event: ListView.Selected) -> None:
+    @on(Input.Changed, "#chat_search")
+    def handle_chat_search(self, event: Input.Changed) -> None:
+        """Filter the sidebar to chats matching the search box"""
+        chat_list = self.query_one("#chat_list", ChatList)
+        query = event.value.strip()
+
+        if not query:
+            chat_list.reload()
+            return
+
+        chat_list.show_search_results(self.chat_manager.search_chats(query))
+
+    @on(OptionList.OptionSelected, "#chat_list")
+    def handle_chat_selection(self, event: OptionList.OptionSelected) -> None:
         """Handle chat selection from sidebar"""
-        if isinstance(event.item, ChatListItem):
-            self._load_chat(event.item.chat_id)
+        chat_id = ChatList.chat_id(event.option)
+        if chat_id is not None:
+            self._load_chat(chat_id)
+
+    @on(Switch.Changed, "#memory_switch")
+    def handle_memory_toggle(self, event: Switch.Changed) -> None:
+        """Load the memory store in the background once memory is turned on"""
+        if event.value and self.warm_up_enabled:
+            self.warm_up_store("memory")
+
+    @on(Switch.Changed, "#documents_switch")
+    def handle_documents_toggle(self, event: Switch.Changed) -> None:
+        """Load the document store in the background once documents are turned on"""
+        if event.value and self.warm_up_enabled:
+            self.warm_up_store("documents")
 
     @on(Switch.Changed, "#logs_switch")
     def handle_logs_toggle(self, event: Switch.Changed) -> None:
@@ -328,21 +664,17 @@ class OpenTerminalUI(App):
 
     def action_delete_chat(self) -> None:
         """Delete the currently selected chat from the sidebar"""
-        chat_list = self.query_one("#chat_list", ListView)
+        chat_list = self.query_one("#chat_list", ChatList)
 
-        # Get the currently highlighted item
-        if chat_list.index is None:
+        # Get the currently highlighted chat
+        chat_id_to_delete = ChatList.chat_id(chat_list.highlighted_option)
+        if chat_id_to_delete is None:
             return
 
-        selected_item = chat_list.highlighted_child
-        if not isinstance(selected_item, ChatListItem):
-            return
-
-        chat_id_to_delete = selected_item.chat_id
-
         # Delete from database
         self.chat_manager.delete_chat(chat_id_to_delete)
-        self.memory_manager.delete_chat(chat_id_to_delete)
+        self.memory_indexer.discard(chat_id_to_delete)
+        self.delete_chat_memory(chat_id_to_delete)
 
         # If we're deleting the current chat, create a new one
         if (
@@ -352,8 +684,8 @@ class OpenTerminalUI(App):
         ):
             self._new_chat()
 
-        # Refresh the sidebar
-        self._refresh_chat_list()
+        # Remove it from the sidebar
+        chat_list.remove_chat(chat_id_to_delete)
 
     def action_toggle_sidebar(self) -> None:
         """Toggle sidebar visibility"""
@@ -363,4 +695,7 @@ class OpenTerminalUI(App):
 
     def action_manage_documents(self) -> None:
         """Open the document management screen"""
-        self.push_screen(DocumentManagerScreen(self.doc_manager))
+        if self._doc_manager is None:
+            self.open_document_manager()
+        else:
+            self.push_screen(DocumentManagerScreen(self._doc_manager))
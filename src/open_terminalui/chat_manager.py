@@ -3,7 +3,11 @@ import sqlite3
 from datetime import datetime
 from pathlib import Path
 
-from ._models import Chat, Message
+from ._models import Chat, ChatSummary, Message
+from .database import Database
+
+# Version of the database schema, stored in PRAGMA user_version
+SCHEMA_VERSION = 3
 
 
 class ChatManager:
@@ -13,6 +17,9 @@ class ChatManager:
         """
         Initialize the chat manager with SQLite database.
 
+        The database stays open for the manager's lifetime, see Database. Call
+        close() to commit pending writes when done.
+
         Args:
             db_path: Path to the SQLite database file. If None, defaults to
                     ~/.open-terminalui/chats.db
@@ -24,26 +31,131 @@ class ChatManager:
             db_path = str(app_dir / "chats.db")
 
         self.db_path = db_path
-        self._init_db()
+        self.db = Database(db_path)
+        self.db.execute_write(self._init_db)
+
+    def close(self):
+        """Commit pending writes and close the database"""
+        self.db.close()
 
-    def _init_db(self):
+    def _init_db(self, conn: sqlite3.Connection):
         """
-        Initialize the database schema.
+        Initialize the database schema, migrating older databases.
 
-        Creates the chats table if it doesn't exist with columns for id, title,
-        messages_json, created_at, and updated_at.
+        Creates the chats table with columns for id, title, created_at, and
+        updated_at, and the messages table with one row per message, keyed by chat_id
+        and the message's position (seq) in the chat. Chats are indexed by
+        updated_at so they can be listed most recent first without a sort, and
+        user and assistant messages are full-text indexed for search_chats().
         """
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS chats (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    title TEXT NOT NULL,
-                    messages_json TEXT NOT NULL,
-                    created_at TEXT NOT NULL,
-                    updated_at TEXT NOT NULL
-                )
-            """)
-            conn.commit()
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+
+        if version < 1:
+            self._migrate_to_v1(conn)
+        if version < 2:
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_chats_updated_at ON chats (updated_at DESC, id DESC)"
+            )
+        if version < 3:
+            self._migrate_to_v3(conn)
+
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _migrate_to_v1(self, conn: sqlite3.Connection):
+        """
+        Move messages from the chats.messages_json column into the messages table.
+
+        Chats are copied into a new chats table without the column, keeping their IDs.
+        Runs in the caller's transaction, so a failed migration leaves the database
+        untouched.
+        """
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS chats (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                title TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS messages (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                chat_id INTEGER NOT NULL REFERENCES chats(id) ON DELETE CASCADE,
+                seq INTEGER NOT NULL,
+                role TEXT NOT NULL,
+                content TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                UNIQUE (chat_id, seq)
+            )
+        """)
+
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(chats)")]
+        if "messages_json" not in columns:
+            return
+
+        # Copy each chat's messages into their own rows
+        rows = conn.execute("SELECT id, messages_json, created_at FROM chats")
+        for chat_id, messages_json, created_at in rows.fetchall():
+            conn.executemany(
+                "INSERT INTO messages (chat_id, seq, role, content, created_at) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (chat_id, seq, msg["role"], msg["content"], created_at)
+                    for seq, msg in enumerate(json.loads(messages_json))
+                ],
+            )
+
+        # Rebuild the chats table without the messages_json column
+        conn.execute("""
+            CREATE TABLE chats_v1 (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                title TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+        """)
+        conn.execute(
+            "INSERT INTO chats_v1 (id, title, created_at, updated_at) SELECT id, title, created_at, updated_at FROM chats"
+        )
+        conn.execute("DROP TABLE chats")
+        conn.execute("ALTER TABLE chats_v1 RENAME TO chats")
+
+    def _migrate_to_v3(self, conn: sqlite3.Connection):
+        """
+        Create the messages_fts full-text index over messages.content.
+
+        The index reads message text from the messages table instead of storing a
+        copy, and triggers keep it in sync. Only user and assistant messages are
+        indexed, search results logged in the chat would drown out the conversation.
+        """
+        conn.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+                content,
+                content='messages',
+                content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2'
+            )
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS messages_fts_insert AFTER INSERT ON messages
+            WHEN new.role IN ('user', 'assistant')
+            BEGIN
+                INSERT INTO messages_fts (rowid, content) VALUES (new.id, new.content);
+            END
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS messages_fts_delete AFTER DELETE ON messages
+            WHEN old.role IN ('user', 'assistant')
+            BEGIN
+                INSERT INTO messages_fts (messages_fts, rowid, content)
+                VALUES ('delete', old.id, old.content);
+            END
+        """)
+
+        # Index existing messages
+        conn.execute("""
+            INSERT INTO messages_fts (rowid, content)
+            SELECT id, content FROM messages WHERE role IN ('user', 'assistant')
+        """)
 
     def create_chat(self, title: str | None = None) -> Chat:
         """
@@ -60,15 +172,15 @@ class ChatManager:
             title = f"Chat {datetime.now().strftime('%Y-%m-%d %H:%M')}"
 
         now = datetime.now()
-        messages_json = json.dumps([])
 
-        with sqlite3.connect(self.db_path) as conn:
+        def insert(conn: sqlite3.Connection) -> int | None:
             cursor = conn.execute(
-                "INSERT INTO chats (title, messages_json, created_at, updated_at) VALUES (?, ?, ?, ?)",
-                (title, messages_json, now.isoformat(), now.isoformat()),
+                "INSERT INTO chats (title, created_at, updated_at) VALUES (?, ?, ?)",
+                (title, now.isoformat(), now.isoformat()),
             )
-            conn.commit()
-            chat_id = cursor.lastrowid
+            return cursor.lastrowid
+
+        chat_id = self.db.execute_write(insert)
 
         return Chat(
             id=chat_id, title=title, messages=[], created_at=now, updated_at=now
@@ -80,57 +192,77 @@ class ChatManager:
 
         If the chat has no ID (newly created), inserts it as a new record.
         If the chat has an ID (existing), updates the existing record.
-        Automatically updates the updated_at timestamp.
+        Only messages that haven't been saved yet (seq is None) are written, so a
+        save costs the same no matter how long the chat is. Automatically updates
+        the updated_at timestamp.
 
         Args:
-            chat: The Chat object to save. The chat.id will be set if it's a new chat.
+            chat: The Chat object to save. The chat.id will be set if it's a new chat,
+                 and each newly written message gets its seq.
         """
-        messages_json = json.dumps([msg.to_dict() for msg in chat.messages])
-        chat.updated_at = datetime.now()
+        updated_at = datetime.now()
+        new_messages = [msg for msg in chat.messages if msg.seq is None]
+        rows = [(msg.role, msg.content) for msg in new_messages]
 
-        with sqlite3.connect(self.db_path) as conn:
-            if chat.id is None:
+        def save(conn: sqlite3.Connection) -> tuple[int, int]:
+            chat_id = chat.id
+            if chat_id is None:
                 # Chat doesn't exist in DB yet, insert it
                 cursor = conn.execute(
-                    "INSERT INTO chats (title, messages_json, created_at, updated_at) VALUES (?, ?, ?, ?)",
-                    (
-                        chat.title,
-                        messages_json,
-                        chat.created_at.isoformat(),
-                        chat.updated_at.isoformat(),
-                    ),
+                    "INSERT INTO chats (title, created_at, updated_at) VALUES (?, ?, ?)",
+                    (chat.title, chat.created_at.isoformat(), updated_at.isoformat()),
                 )
-                chat.id = cursor.lastrowid
+                chat_id = cursor.lastrowid
+                assert chat_id is not None
             else:
                 # Chat exists, update it
                 conn.execute(
-                    "UPDATE chats SET title = ?, messages_json = ?, updated_at = ? WHERE id = ?",
-                    (chat.title, messages_json, chat.updated_at.isoformat(), chat.id),
+                    "UPDATE chats SET title = ?, updated_at = ? WHERE id = ?",
+                    (chat.title, updated_at.isoformat(), chat_id),
                 )
-            conn.commit()
 
-    def load_chat(self, chat_id: int) -> Chat | None:
+            # Append new messages after the last saved one
+            next_seq = conn.execute(
+                "SELECT COALESCE(MAX(seq) + 1, 0) FROM messages WHERE chat_id = ?",
+                (chat_id,),
+            ).fetchone()[0]
+            conn.executemany(
+                "INSERT INTO messages (chat_id, seq, role, content, created_at) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (chat_id, seq, role, content, updated_at.isoformat())
+                    for seq, (role, content) in enumerate(rows, start=next_seq)
+                ],
+            )
+            return chat_id, next_seq
+
+        # Waits for the commit, reads on other threads carry on meanwhile
+        chat_id, next_seq = self.db.execute_write(save)
+
+        chat.id = chat_id
+        chat.updated_at = updated_at
+        for seq, msg in enumerate(new_messages, start=next_seq):
+            msg.seq = seq
+
+    def load_chat(self, chat_id: int, limit: int | None = None) -> Chat | None:
         """
         Load a chat from the database by its ID.
 
         Args:
             chat_id: The unique identifier of the chat to load
+            limit: Load only the most recent `limit` messages. If None, loads all of
+                  them. Older messages can be loaded with load_messages().
 
         Returns:
             The Chat object if found, None if no chat exists with the given ID
         """
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self.db.read() as conn:
             cursor = conn.execute("SELECT * FROM chats WHERE id = ?", (chat_id,))
             row = cursor.fetchone()
 
-        if row is None:
-            return None
+            if row is None:
+                return None
 
-        messages_data = json.loads(row["messages_json"])
-        messages = [
-            Message(role=msg["role"], content=msg["content"]) for msg in messages_data
-        ]
+            messages = self._select_messages(conn, chat_id, limit=limit)
 
         return Chat(
             id=row["id"],
@@ -140,48 +272,155 @@ class ChatManager:
             updated_at=datetime.fromisoformat(row["updated_at"]),
         )
 
-    def list_chats(self) -> list[Chat]:
+    def load_messages(
+        self, chat_id: int, before_seq: int | None = None, limit: int | None = None
+    ) -> list[Message]:
         """
-        List all chats from the database.
+        Load a range of a chat's messages.
+
+        Args:
+            chat_id: The unique identifier of the chat
+            before_seq: Load only messages before this position. If None, loads up to
+                       the latest message.
+            limit: Load only the last `limit` messages of the range. If None, loads
+                  all of them.
 
         Returns:
-            List of all Chat objects ordered by updated_at timestamp in descending order
-            (most recently updated first). Returns empty list if no chats exist.
+            List of Message objects in chat order
         """
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute(
-                "SELECT id, messages_json, title, created_at, updated_at FROM chats ORDER BY updated_at DESC"
-            )
-            rows = cursor.fetchall()
-        # messages_json = json.dumps([msg.to_dict() for msg in chat.messages])
-
-        chats = []
-        for row in rows:
-            messages_data = json.loads(row["messages_json"])
-            messages = [
-                Message(role=msg["role"], content=msg["content"])
-                for msg in messages_data
-            ]
-            chats.append(
-                Chat(
-                    row["id"],
-                    row["title"],
-                    messages,
-                    datetime.fromisoformat(row["updated_at"]),
-                    datetime.fromisoformat(row["updated_at"]),
-                )
+        with self.db.read() as conn:
+            return self._select_messages(conn, chat_id, before_seq, limit)
+
+    def _select_messages(
+        self,
+        conn: sqlite3.Connection,
+        chat_id: int,
+        before_seq: int | None = None,
+        limit: int | None = None,
+    ) -> list[Message]:
+        query = "SELECT seq, role, content FROM messages WHERE chat_id = ?"
+        params: list = [chat_id]
+
+        if before_seq is not None:
+            query += " AND seq < ?"
+            params.append(before_seq)
+
+        # Newest first so LIMIT keeps the most recent messages, reversed below
+        query += " ORDER BY seq DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        rows = conn.execute(query, params).fetchall()
+        return [
+            Message(role=row["role"], content=row["content"], seq=row["seq"])
+            for row in reversed(rows)
+        ]
+
+    def list_chat_summaries(
+        self, limit: int | None = None, after: ChatSummary | None = None
+    ) -> list[ChatSummary]:
+        """
+        List chat metadata without loading any messages.
+
+        Pages are fetched with keyset paging: pass the last summary of the previous
+        page as `after` to get the next one. Unlike OFFSET, this reads only the rows
+        it returns, however deep the page is.
+
+        Args:
+            limit: Maximum number of chats to return. If None, returns all of them.
+            after: The last chat of the previous page. If None, starts from the most
+                  recently updated chat.
+
+        Returns:
+            List of ChatSummary objects ordered by updated_at timestamp in descending
+            order (most recently updated first)
+        """
+        query = "SELECT id, title, updated_at FROM chats"
+        params: list = []
+
+        if after is not None:
+            query += " WHERE (updated_at, id) < (?, ?)"
+            params += [after.updated_at.isoformat(), after.id]
+
+        query += " ORDER BY updated_at DESC, id DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        with self.db.read() as conn:
+            rows = conn.execute(query, params).fetchall()
+
+        return [
+            ChatSummary(
+                id=chat_id,
+                title=title,
+                updated_at=datetime.fromisoformat(updated_at),
             )
+            for chat_id, title, updated_at in rows
+        ]
+
+    def search_chats(self, query: str, limit: int = 50) -> list[ChatSummary]:
+        """
+        Find chats whose messages contain every word of the query.
+
+        Uses the full-text index, so it doesn't touch Ollama or the vector store.
+        The last word also matches as a prefix, so results update while typing.
 
-        return chats
+        Args:
+            query: The words to search for. FTS5 syntax is not interpreted.
+            limit: Maximum number of chats to return
+
+        Returns:
+            List of ChatSummary objects, best match first
+        """
+        match = _fts_query(query)
+        if not match:
+            return []
+
+        with self.db.read() as conn:
+            rows = conn.execute(
+                """
+                SELECT chats.id, chats.title, chats.updated_at
+                FROM messages_fts
+                JOIN messages ON messages.id = messages_fts.rowid
+                JOIN chats ON chats.id = messages.chat_id
+                WHERE messages_fts MATCH ?
+                GROUP BY chats.id
+                ORDER BY MIN(messages_fts.rank), chats.updated_at DESC
+                LIMIT ?
+                """,
+                (match, limit),
+            ).fetchall()
+
+        return [
+            ChatSummary(
+                id=chat_id,
+                title=title,
+                updated_at=datetime.fromisoformat(updated_at),
+            )
+            for chat_id, title, updated_at in rows
+        ]
 
     def delete_chat(self, chat_id: int):
         """
-        Delete a chat from the database.
+        Delete a chat and its messages from the database.
 
         Args:
             chat_id: The unique identifier of the chat to delete
         """
-        with sqlite3.connect(self.db_path) as conn:
+
+        def delete(conn: sqlite3.Connection) -> None:
+            conn.execute("DELETE FROM messages WHERE chat_id = ?", (chat_id,))
             conn.execute("DELETE FROM chats WHERE id = ?", (chat_id,))
-            conn.commit()
+
+        self.db.execute_write(delete)
+
+
+def _fts_query(query: str) -> str:
+    """Turn user input into an FTS5 query matching all of its words"""
+    # Quote each word so characters like - or " aren't parsed as FTS5 operators
+    terms = ['"' + word.replace('"', '""') + '"' for word in query.split()]
+    if terms:
+        terms[-1] += "*"
+    return " ".join(terms)
@@ -1,4 +1,5 @@
-from .chat_list_item import ChatListItem
+from .chat_list import ChatList
 from .chat_message import ChatMessage
+from .streaming_chat_message import StreamingChatMessage
 
-__all__ = ["ChatListItem", "ChatMessage"]
+__all__ = ["ChatList", "ChatMessage", "StreamingChatMessage"]
@@ -0,0 +1,132 @@
+from typing import Callable
+
+from textual.content import Content
+from textual.widgets import OptionList
+from textual.widgets.option_list import Option, OptionDoesNotExist
+
+from open_terminalui._models import ChatSummary
+
+
+class ChatList(OptionList):
+    """
+    Sidebar list of chats, loaded a page at a time as the user scrolls.
+
+    Rows are options rather than widgets, so only the visible lines are rendered
+    no matter how many chats have been loaded.
+    """
+
+    def __init__(
+        self,
+        load_page: Callable[[int, ChatSummary | None], list[ChatSummary]],
+        page_size: int = 100,
+        *args,
+        **kwargs,
+    ):
+        """
+        Initialize the list. Call reload() to load the first page.
+
+        Args:
+            load_page: Returns up to `limit` chats that come after the given chat,
+                      most recently updated first
+            page_size: Number of chats to load at a time
+        """
+        super().__init__(*args, **kwargs)
+        self.load_page = load_page
+        self.page_size = page_size
+        self._last: ChatSummary | None = None
+        self._exhausted = False
+        self.searching = False
+
+    @staticmethod
+    def chat_id(option: Option | None) -> int | None:
+        """The chat ID of an option, or None if there is no option"""
+        return None if option is None or option.id is None else int(option.id)
+
+    def reload(self) -> None:
+        """Drop the loaded rows and load the first page again"""
+        self.clear_options()
+        self.searching = False
+        self._last = None
+        self._exhausted = False
+        self.load_more()
+
+    def show_search_results(self, chats: list[ChatSummary]) -> None:
+        """Replace the rows with search results until reload() is called"""
+        self.searching = True
+        # Results aren't paged
+        self._exhausted = True
+        self.set_options(self._make_option(chat) for chat in chats)
+
+    def load_more(self) -> None:
+        """Load the next page of chats, if there are any left"""
+        if self._exhausted:
+            return
+
+        chats = self.load_page(self.page_size, self._last)
+        if len(chats) < self.page_size:
+            self._exhausted = True
+        if not chats:
+            return
+
+        self._last = chats[-1]
+        self.add_options(
+            self._make_option(chat) for chat in chats if not self._is_loaded(chat.id)
+        )
+
+    def upsert_chat(self, chat: ChatSummary) -> None:
+        """
+        Show a saved chat at the top of the list, moving its row if already loaded.
+
+        Args:
+            chat: The chat that was just saved
+        """
+        if self.searching:
+            # Leave search results alone, the list is reloaded when search is cleared
+            return
+
+        option_id = str(chat.id)
+        if self.option_count and self.options[0].id == option_id:
+            # Usually the chat is already on top, only its title can have changed
+            self.replace_option_prompt(option_id, Content(chat.title))
+            return
+
+        # OptionList can't insert a row, so moving one to the top re-adds the rest
+        highlighted = self.highlighted_option
+        highlighted_id = highlighted.id if highlighted is not None else None
+        scroll_y = self.scroll_y
+
+        options = [option for option in self.options if option.id != option_id]
+        self.set_options([self._make_option(chat), *options])
+
+        if highlighted_id is not None:
+            self.highlighted = self.get_option_index(highlighted_id)
+        self.scroll_y = scroll_y
+
+    def remove_chat(self, chat_id: int) -> None:
+        """Remove a chat's row if it's loaded"""
+        if self._is_loaded(chat_id):
+            self.remove_option(str(chat_id))
+
+    def _is_loaded(self, chat_id: int) -> bool:
+        try:
+            self.get_option(str(chat_id))
+        except OptionDoesNotExist:
+            return False
+        return True
+
+    def _make_option(self, chat: ChatSummary) -> Option:
+        # Content() so titles are never parsed as markup
+        return Option(Content(chat.title), id=str(chat.id))
+
+    def watch_scroll_y(self, old_value: float, new_value: float) -> None:
+        super().watch_scroll_y(old_value, new_value)
+        # Load the next page before the user scrolls to the end of the loaded rows
+        near_end = self.max_scroll_y - self.scrollable_content_region.height
+        if new_value > old_value and new_value >= near_end:
+            self.load_more()
+
+    def watch_highlighted(self, highlighted: int | None) -> None:
+        super().watch_highlighted(highlighted)
+        # Keyboard navigation past the loaded rows
+        if highlighted is not None and highlighted >= self.option_count - 1:
+            self.load_more()
@@ -1,4 +1,6 @@
 from textual.app import ComposeResult
+from textual.containers import ScrollableContainer
+from textual.message import Message
 from textual.widgets import (
     Label,
     Static,
@@ -8,28 +10,52 @@ from textual.widgets import (
 class ChatMessage(Static):
     """A single chat message widget with label"""
 
+    class Append(Message, bubble=False):
+        """Posted to a ChatMessage to append streamed text to its content"""
+
+        def __init__(self, text: str) -> None:
+            super().__init__()
+            self.text = text
+
     def __init__(self, content: str, role: str, *args, **kwargs):
-        super().__init__(*args, **kwargs)
+        # Setting self.content also goes through Static, which must not parse it
+        super().__init__(*args, markup=False, **kwargs)
         self.role: str = role
         self.content: str = content
         self.add_class(f"message-{role}")
 
-    def compose(self) -> ComposeResult:
+    @property
+    def label_text(self) -> str:
+        """The label displayed above the message content"""
         if self.role == "user":
-            label_text = "User:"
+            return "User:"
         elif self.role == "web_search":
-            label_text = "Web Search Results:"
+            return "Web Search Results:"
         elif self.role == "document_search":
-            label_text = "Vector Search Results:"
+            return "Vector Search Results:"
         elif self.role == "memory_search":
-            label_text = "Memory Search Results:"
+            return "Memory Search Results:"
         else:
-            label_text = "Assistant:"
-        yield Label(label_text, classes=f"message-label-{self.role}")
-        yield Static(self.content, classes="message-content")
+            return "Assistant:"
+
+    def compose(self) -> ComposeResult:
+        yield Label(self.label_text, classes=f"message-label-{self.role}")
+        # Model output and search results are shown as-is, never parsed as markup
+        yield Static(self.content, classes="message-content", markup=False)
 
     def update_content(self, new_content: str) -> None:
         """Update the message content"""
         self.content = new_content
         content_widget = self.query_one(".message-content", Static)
         content_widget.update(new_content)
+
+    def append_content(self, text: str) -> None:
+        """Append text to the message content"""
+        self.update_content(self.content + text)
+
+    def on_chat_message_append(self, event: "ChatMessage.Append") -> None:
+        """Apply a streamed append and keep the chat scrolled to the bottom"""
+        self.append_content(event.text)
+
+        if isinstance(self.parent, ScrollableContainer):
+            self.parent.scroll_end(animate=False)
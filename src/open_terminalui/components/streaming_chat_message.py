@@ -0,0 +1,79 @@
+from textual.app import ComposeResult
+from textual.containers import Vertical
+from textual.widgets import (
+    Label,
+    Static,
+)
+
+from .chat_message import ChatMessage
+
+
+class StreamingChatMessage(ChatMessage):
+    """
+    A chat message widget that renders streamed text append-only.
+
+    Finished lines are frozen into static segments and only the trailing open
+    line is re-rendered on each append, so the cost of an append doesn't grow
+    with the length of the message.
+    """
+
+    def __init__(self, content: str, role: str, *args, **kwargs):
+        self._parts: list[str] = []
+        self._open_line = ""
+        super().__init__(content, role, *args, **kwargs)
+
+    @property
+    def content(self) -> str:
+        """The full message text"""
+        return "".join(self._parts)
+
+    @content.setter
+    def content(self, value: str) -> None:
+        self._parts = [value] if value else []
+        self._open_line = value.rsplit("\n", 1)[-1]
+
+    def compose(self) -> ComposeResult:
+        yield Label(self.label_text, classes=f"message-label-{self.role}")
+        with Vertical(classes="message-segments"):
+            if "\n" in self.content:
+                yield self._make_segment(self.content.rsplit("\n", 1)[0])
+            # Markup is disabled like in ChatMessage, a tag could also be split
+            # across segments
+            yield Static(
+                self._open_line,
+                classes="message-content message-tail",
+                markup=False,
+            )
+
+    def _make_segment(self, text: str) -> Static:
+        """Create a frozen segment for lines that have finished streaming"""
+        return Static(
+            text,
+            classes="message-content message-segment",
+            markup=False,
+        )
+
+    def update_content(self, new_content: str) -> None:
+        """Replace the message content, re-rendering every segment"""
+        self.query(".message-segment").remove()
+        self._parts = []
+        self._open_line = ""
+        self.append_content(new_content)
+
+    def append_content(self, text: str) -> None:
+        """Append text, re-rendering only the trailing open line"""
+        if not text:
+            return
+
+        self._parts.append(text)
+        open_line = self._open_line + text
+        tail = self.query_one(".message-tail", Static)
+
+        # Freeze the lines that are now complete into one new segment
+        if "\n" in open_line:
+            finished, open_line = open_line.rsplit("\n", 1)
+            segments = self.query_one(".message-segments", Vertical)
+            segments.mount(self._make_segment(finished), before=tail)
+
+        self._open_line = open_line
+        tail.update(open_line)
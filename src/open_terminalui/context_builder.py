@@ -0,0 +1,376 @@
+import json
+import os
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable
+
+from open_terminalui.tools.retrieval import ContextBlock, RetrievalResult
+
+# "stable_prefix" keeps earlier turns byte-identical between requests so Ollama can
+# reuse its KV cache, "prepend" puts retrieval context in front of the history
+PROMPT_LAYOUTS = ("stable_prefix", "prepend")
+
+# Per-message token overhead for the role and chat template markers
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def prompt_layout_from_env() -> str:
+    """
+    The prompt layout from OPEN_TERMINALUI_PROMPT_LAYOUT, "stable_prefix" if unset.
+
+    Raises:
+        ValueError: If the layout is unknown
+    """
+    layout = os.environ.get("OPEN_TERMINALUI_PROMPT_LAYOUT") or "stable_prefix"
+    if layout not in PROMPT_LAYOUTS:
+        raise ValueError(
+            f"Unknown prompt layout {layout!r} in OPEN_TERMINALUI_PROMPT_LAYOUT, "
+            f"expected one of {', '.join(PROMPT_LAYOUTS)}"
+        )
+    return layout
+
+
+def assemble_messages(
+    history: list[dict], context: list[dict], layout: str = "stable_prefix"
+) -> list[dict]:
+    """
+    Combine the chat history with this turn's retrieval context.
+
+    Args:
+        history: The chat history in Ollama API format, ending with the latest user
+                message
+        context: System messages holding this turn's retrieval results
+        layout: One of PROMPT_LAYOUTS. "stable_prefix" places the context right
+               before the latest user message, so everything before it matches the
+               previous request. "prepend" places it before the whole history.
+
+    Returns:
+        The messages to send to Ollama
+
+    Raises:
+        ValueError: If the layout is unknown
+    """
+    if layout == "prepend":
+        return context + history
+
+    if layout == "stable_prefix":
+        if history and history[-1]["role"] == "user":
+            return history[:-1] + context + history[-1:]
+        return history + context
+
+    raise ValueError(f"Unknown prompt layout: {layout}")
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of text, assuming about 4 characters per token"""
+    return (len(text) + 3) // 4
+
+
+def message_tokens(message: dict) -> int:
+    """Estimate the token count of a message in Ollama API format"""
+    return estimate_tokens(message["content"]) + MESSAGE_OVERHEAD_TOKENS
+
+
+@dataclass
+class ContextUsage:
+    budget: int
+    summary: int = 0  # Summary of compacted turns
+    history: int = 0
+    retrieval: int = 0
+    dropped_messages: int = 0
+    dropped_blocks: int = 0
+    summary_failed: bool = False  # Dropped messages couldn't be summarized
+
+    @property
+    def total(self) -> int:
+        return self.summary + self.history + self.retrieval
+
+    def __str__(self) -> str:
+        report = (
+            f"context: {self.total}/{self.budget} tokens (summary {self.summary}, "
+            f"history {self.history}, retrieval {self.retrieval}), dropped "
+            f"{self.dropped_messages} messages and {self.dropped_blocks} blocks"
+        )
+        if self.summary_failed:
+            report += ", summarizing them failed"
+        return report
+
+
+class ContextBuilder:
+    """Assembles the messages for a request while keeping it under a token budget"""
+
+    def __init__(
+        self,
+        max_tokens: int = 4096,
+        reserve_tokens: int = 1024,
+        retrieval_share: float = 0.5,
+        compact_to: float = 0.5,
+        layout: str = "stable_prefix",
+        summarizer: Callable[[list[dict]], str] | None = None,
+    ):
+        """
+        Initialize the context builder.
+
+        Args:
+            max_tokens: Size of the model's context window in tokens
+            reserve_tokens: Tokens kept free for the response (default: 1024)
+            retrieval_share: Largest fraction of the budget retrieval results may
+                            use (default: 0.5)
+            compact_to: When the history overflows its budget, older turns are
+                       dropped until it fits in this fraction of the budget. Dropping
+                       more than strictly needed keeps the prompt prefix stable for
+                       the next few turns (default: 0.5)
+            layout: Where retrieval context goes, one of PROMPT_LAYOUTS
+            summarizer: Optional callable that condenses dropped messages (and the
+                       previous summary, as a system message) into a summary. It gets
+                       the latest dropped messages that fit in the budget. If None, or
+                       if it raises, dropped messages are discarded.
+        """
+        if layout not in PROMPT_LAYOUTS:
+            raise ValueError(f"Unknown prompt layout: {layout}")
+
+        self.max_tokens = max_tokens
+        self.reserve_tokens = reserve_tokens
+        self.retrieval_share = retrieval_share
+        self.compact_to = compact_to
+        self.layout = layout
+        self.summarizer = summarizer
+        self.reset()
+
+    @property
+    def budget(self) -> int:
+        """Tokens available for the prompt"""
+        return max(0, self.max_tokens - self.reserve_tokens)
+
+    def reset(self) -> None:
+        """Forget compaction state, e.g. when switching to another chat"""
+        self._history_start = 0
+        self._summary: str | None = None
+
+    def build(
+        self, history: list[dict], results: list[RetrievalResult]
+    ) -> tuple[list[dict], ContextUsage]:
+        """
+        Build the messages for a request.
+
+        Retrieval blocks are admitted in order of score within each retriever, taking
+        turns between retrievers, until the retrieval share of the budget is used. The
+        history gets the rest of the budget. The latest message is always kept.
+
+        Args:
+            history: The chat history in Ollama API format
+            results: This turn's retrieval results
+
+        Returns:
+            Tuple of (messages to send, token usage report)
+        """
+        usage = ContextUsage(budget=self.budget)
+
+        context, usage.retrieval, usage.dropped_blocks = self._select_context(
+            results, int(self.budget * self.retrieval_share)
+        )
+
+        history_budget = self.budget - usage.retrieval
+        if self._history_start > len(history):
+            self.reset()
+
+        kept = history[self._history_start :]
+        tokens = [message_tokens(message) for message in kept]
+        summary_tokens = self._summary_tokens()
+
+        if summary_tokens + sum(tokens) > history_budget:
+            usage.summary_failed = not self._compact(
+                history, tokens, int(history_budget * self.compact_to)
+            )
+            kept = history[self._history_start :]
+            tokens = tokens[len(tokens) - len(kept) :]
+            summary_tokens = self._summary_tokens()
+
+        usage.summary = summary_tokens
+        usage.history = sum(tokens)
+        usage.dropped_messages = self._history_start
+
+        messages = assemble_messages(kept, context, layout=self.layout)
+        if self._summary is not None:
+            messages = [self._summary_message()] + messages
+
+        return messages, usage
+
+    def _select_context(
+        self, results: list[RetrievalResult], budget: int
+    ) -> tuple[list[dict], int, int]:
+        """
+        Pick the retrieval blocks that fit in the budget.
+
+        Returns:
+            Tuple of (system messages, tokens used, number of blocks dropped)
+        """
+        ranked = [
+            sorted(result.blocks, key=lambda block: block.score, reverse=True)
+            for result in results
+        ]
+        selected: list[list[ContextBlock]] = [[] for _ in results]
+        used = 0
+
+        # Take the best remaining block from each retriever in turn
+        for rank in range(max((len(blocks) for blocks in ranked), default=0)):
+            for i, blocks in enumerate(ranked):
+                if rank >= len(blocks):
+                    continue
+
+                cost = estimate_tokens(blocks[rank].text)
+                if not selected[i]:
+                    # The first block also pays for the system message around it
+                    cost += message_tokens(results[i].to_system_message([]))
+
+                if used + cost <= budget:
+                    selected[i].append(blocks[rank])
+                    used += cost
+
+        # Keep the retriever's own order for the admitted blocks
+        context = []
+        for result, blocks in zip(results, selected):
+            if blocks:
+                admitted = [block for block in result.blocks if block in blocks]
+                context.append(result.to_system_message(admitted))
+
+        total_blocks = sum(len(result.blocks) for result in results)
+        dropped = total_blocks - sum(len(blocks) for blocks in selected)
+        return context, used, dropped
+
+    def _compact(self, history: list[dict], tokens: list[int], target: int) -> bool:
+        """
+        Advance the start of the kept history until it fits the target.
+
+        Returns:
+            False if the dropped messages couldn't be summarized
+        """
+        start = self._history_start
+        remaining = sum(tokens)
+        i = 0
+
+        # Always keep the latest message, and start the kept history on a user turn
+        while i < len(tokens) - 1 and (
+            remaining > target or history[start + i]["role"] != "user"
+        ):
+            remaining -= tokens[i]
+            i += 1
+
+        dropped = history[start : start + i]
+        self._history_start = start + i
+
+        if not dropped or self.summarizer is None:
+            return True
+
+        # The summary request has the same budget, older messages that don't fit
+        # are dropped without being summarized
+        previous = [self._summary_message()] if self._summary is not None else []
+        remaining = self.budget - sum(message_tokens(message) for message in previous)
+        first = len(dropped)
+        while first > 0 and message_tokens(dropped[first - 1]) <= remaining:
+            first -= 1
+            remaining -= message_tokens(dropped[first])
+
+        try:
+            self._summary = self.summarizer(previous + dropped[first:])
+        except Exception:
+            # Keep the previous summary rather than failing the request
+            return False
+        return True
+
+    def _summary_message(self) -> dict:
+        return {
+            "role": "system",
+            "content": f"Summary of the earlier conversation:\n\n{self._summary}",
+        }
+
+    def _summary_tokens(self) -> int:
+        if self._summary is None:
+            return 0
+        return message_tokens(self._summary_message())
+
+
+@dataclass
+class PromptStats:
+    layout: str
+    prompt_eval_count: int  # Prompt tokens Ollama had to evaluate (cache misses)
+    prompt_eval_duration: float  # Seconds
+    eval_count: int  # Generated tokens
+    eval_duration: float  # Seconds
+
+    @classmethod
+    def from_response(cls, layout: str, response: Any) -> "PromptStats":
+        """Read the timing fields from the final chunk of an Ollama response"""
+        return cls(
+            layout=layout,
+            prompt_eval_count=response.get("prompt_eval_count") or 0,
+            prompt_eval_duration=(response.get("prompt_eval_duration") or 0) / 1e9,
+            eval_count=response.get("eval_count") or 0,
+            eval_duration=(response.get("eval_duration") or 0) / 1e9,
+        )
+
+    def save(self, path: str | None = None) -> None:
+        """
+        Append the stats to a JSON lines file.
+
+        Args:
+            path: Path of the stats file. If None, defaults to
+                 ~/.open-terminalui/prompt_stats.jsonl
+        """
+        if path is None:
+            app_dir = Path.home() / ".open-terminalui"
+            app_dir.mkdir(exist_ok=True)
+            path = str(app_dir / "prompt_stats.jsonl")
+
+        record = {"timestamp": datetime.now().isoformat(), **asdict(self)}
+        with open(path, "a") as f:
+            f.write(json.dumps(record) + "\n")
+
+    def __str__(self) -> str:
+        return (
+            f"[{self.layout}] prompt eval: {self.prompt_eval_count} tokens in "
+            f"{self.prompt_eval_duration:.2f}s, generation: {self.eval_count} tokens "
+            f"in {self.eval_duration:.2f}s"
+        )
+
+
+def summarize_prompt_stats(stats: list[PromptStats]) -> dict[str, dict[str, float]]:
+    """
+    Average prompt evaluation cost per layout, to compare KV cache reuse.
+
+    Args:
+        stats: Stats collected from previous turns
+
+    Returns:
+        Dict mapping each layout to its turn count and mean prompt eval tokens and
+        seconds per turn
+    """
+    summary: dict[str, dict[str, float]] = {}
+    for stat in stats:
+        layout_summary = summary.setdefault(
+            stat.layout,
+            {"turns": 0, "prompt_eval_count": 0.0, "prompt_eval_duration": 0.0},
+        )
+        layout_summary["turns"] += 1
+        layout_summary["prompt_eval_count"] += stat.prompt_eval_count
+        layout_summary["prompt_eval_duration"] += stat.prompt_eval_duration
+
+    for layout_summary in summary.values():
+        layout_summary["prompt_eval_count"] /= layout_summary["turns"]
+        layout_summary["prompt_eval_duration"] /= layout_summary["turns"]
+
+    return summary
+
+
+def prompt_stats_path() -> str | None:
+    """
+    Where to save each turn's PromptStats, from OPEN_TERMINALUI_PROMPT_STATS.
+
+    Returns:
+        None if saving is disabled, "" to use the default path, otherwise the path
+    """
+    value = os.environ.get("OPEN_TERMINALUI_PROMPT_STATS")
+    if not value or value == "0":
+        return None
+    return "" if value == "1" else value
@@ -0,0 +1,187 @@
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Callable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+WriteJob = Callable[[sqlite3.Connection], T]
+
+
+class Database:
+    """
+    A SQLite database shared across the UI and worker threads.
+
+    Each thread reads through its own long-lived connection. All writes go through
+    a single writer thread, which runs queued writes together in one transaction.
+    The database is in WAL mode, so reads never wait for a write to finish.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        cache_size: int = 16384,
+        max_batch: int = 64,
+        busy_timeout: float = 5.0,
+    ):
+        """
+        Open the database and start the writer thread.
+
+        Args:
+            path: Path to the SQLite database file
+            cache_size: Page cache size per connection, in KiB
+            max_batch: Most queued writes committed in one transaction
+            busy_timeout: Seconds to wait for another process's lock
+        """
+        self.path = path
+        self.cache_size = cache_size
+        self.max_batch = max_batch
+        self.busy_timeout = busy_timeout
+
+        self._local = threading.local()
+        self._writes: queue.Queue[tuple[WriteJob, Future] | None] = queue.Queue()
+        self._closed = False
+
+        # Open the writer connection first, so WAL mode is set before any reads
+        writer_ready: Future[None] = Future()
+        self._writer = threading.Thread(
+            target=self._run_writer,
+            args=(writer_ready,),
+            name="sqlite-writer",
+            daemon=True,
+        )
+        self._writer.start()
+        writer_ready.result()
+
+    @contextmanager
+    def read(self) -> Iterator[sqlite3.Connection]:
+        """
+        Read from the database in a single transaction.
+
+        All queries in the block see the same snapshot, even if writes are
+        committed in the meantime.
+
+        Yields:
+            This thread's read connection
+        """
+        conn = self._connection()
+        if conn.in_transaction:
+            # Nested in another read on this thread, which already has a snapshot
+            yield conn
+            return
+
+        conn.execute("BEGIN")
+        try:
+            yield conn
+        finally:
+            conn.execute("COMMIT")
+
+    def write(self, job: WriteJob[T]) -> "Future[T]":
+        """
+        Queue a write to run on the writer thread.
+
+        Args:
+            job: Called with the writer connection inside a transaction. If it
+                raises, only its own changes are rolled back.
+
+        Returns:
+            A future that resolves to the job's return value once committed
+        """
+        if self._closed:
+            raise RuntimeError("Database is closed")
+
+        future: Future[T] = Future()
+        self._writes.put((job, future))
+        return future
+
+    def execute_write(self, job: WriteJob[T]) -> T:
+        """Run a write on the writer thread and wait until it's committed"""
+        return self.write(job).result()
+
+    def close(self) -> None:
+        """Commit queued writes and stop the writer thread"""
+        if self._closed:
+            return
+        self._closed = True
+        self._writes.put(None)
+        self._writer.join()
+
+    def _connection(self) -> sqlite3.Connection:
+        """This thread's connection, opened on first use"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.path,
+                timeout=self.busy_timeout,
+                # Transactions are managed explicitly with BEGIN/COMMIT
+                isolation_level=None,
+                # Statements are prepared once and reused for the connection's life
+                cached_statements=256,
+            )
+            conn.row_factory = sqlite3.Row
+            conn.execute(f"PRAGMA cache_size = -{self.cache_size}")
+            self._local.conn = conn
+        return conn
+
+    def _run_writer(self, ready: "Future[None]") -> None:
+        try:
+            conn = self._connection()
+            conn.execute("PRAGMA journal_mode = WAL")
+            # Safe with WAL: a crash can only lose the last commits, never corrupt
+            conn.execute("PRAGMA synchronous = NORMAL")
+        except Exception as e:
+            ready.set_exception(e)
+            return
+        ready.set_result(None)
+
+        while True:
+            batch = [self._writes.get()]
+            # Take whatever else is already queued, up to max_batch
+            while batch[-1] is not None and len(batch) < self.max_batch:
+                try:
+                    batch.append(self._writes.get_nowait())
+                except queue.Empty:
+                    break
+
+            jobs = [item for item in batch if item is not None]
+            if jobs:
+                self._commit_batch(conn, jobs)
+
+            if batch[-1] is None:
+                conn.close()
+                return
+
+    def _commit_batch(
+        self, conn: sqlite3.Connection, jobs: list[tuple[WriteJob, Future]]
+    ) -> None:
+        """Run jobs in one transaction, each in its own savepoint"""
+        results: list[tuple[Future, object, BaseException | None]] = []
+
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for job, future in jobs:
+                conn.execute("SAVEPOINT job")
+                try:
+                    result = job(conn)
+                except Exception as e:
+                    conn.execute("ROLLBACK TO job")
+                    results.append((future, None, e))
+                else:
+                    results.append((future, result, None))
+                conn.execute("RELEASE job")
+            conn.execute("COMMIT")
+        except Exception as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            for _, future in jobs:
+                future.set_exception(e)
+            return
+
+        # Resolve only after the commit, so callers can read their own writes
+        for future, result, error in results:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
@@ -0,0 +1,407 @@
+import sqlite3
+from datetime import datetime
+from typing import AbstractSet, Dict, Iterable, List, Set, Tuple
+
+from open_terminalui._models import Document
+from open_terminalui.database import Database
+
+# Version of the database schema, stored in PRAGMA user_version
+SCHEMA_VERSION = 1
+
+
+class DocumentIndex:
+    """
+    Catalog of documents and their chunks, with a full-text (BM25) index.
+
+    Chunks are content-addressed: a chunk's ID is the hash of its text, and a
+    document is a list of chunk IDs. Identical chunks, within a document or shared
+    between documents, are stored once. Documents with the same content share one
+    list, however many paths they were added from.
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Open the index, creating it if needed.
+
+        Args:
+            db_path: Path to the SQLite database file
+        """
+        self.db_path = db_path
+        self.db = Database(db_path)
+        self.db.execute_write(self._init_db)
+
+    def _init_db(self, conn: sqlite3.Connection):
+        """
+        Initialize the database schema.
+
+        Creates the documents table (the catalog, one row per added path), the
+        document_chunks table (the chunk IDs of each distinct file content, in
+        order), the chunks table (the text of each distinct chunk) and the
+        chunks_fts full-text index over it, kept in sync by triggers.
+        """
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+
+        if version < 1:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS documents (
+                    file_path TEXT PRIMARY KEY,
+                    file_name TEXT NOT NULL,
+                    file_hash TEXT NOT NULL,
+                    chunk_count INTEGER NOT NULL DEFAULT 0,
+                    size INTEGER,
+                    ingested_at TEXT
+                )
+            """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_documents_file_hash ON documents (file_hash)"
+            )
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS document_chunks (
+                    file_hash TEXT NOT NULL,
+                    chunk_index INTEGER NOT NULL,
+                    chunk_id TEXT NOT NULL,
+                    PRIMARY KEY (file_hash, chunk_index)
+                )
+            """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_document_chunks_chunk_id ON document_chunks (chunk_id)"
+            )
+            # An explicit rowid, which VACUUM can't renumber under the FTS index
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS chunks (
+                    rowid INTEGER PRIMARY KEY,
+                    id TEXT NOT NULL UNIQUE,
+                    content TEXT NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS chunks_fts USING fts5(
+                    content,
+                    content='chunks',
+                    content_rowid='rowid',
+                    tokenize='unicode61 remove_diacritics 2'
+                )
+            """)
+            conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS chunks_fts_insert AFTER INSERT ON chunks
+                BEGIN
+                    INSERT INTO chunks_fts (rowid, content)
+                    VALUES (new.rowid, new.content);
+                END
+            """)
+            conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS chunks_fts_delete AFTER DELETE ON chunks
+                BEGIN
+                    INSERT INTO chunks_fts (chunks_fts, rowid, content)
+                    VALUES ('delete', old.rowid, old.content);
+                END
+            """)
+
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def get_document_hash(self, file_path: str) -> str | None:
+        """Return the content hash a path was added with, or None if not added"""
+        with self.db.read() as conn:
+            row = conn.execute(
+                "SELECT file_hash FROM documents WHERE file_path = ?", (file_path,)
+            ).fetchone()
+        return row[0] if row is not None else None
+
+    def has_content(self, file_hash: str) -> bool:
+        """Return whether a document with this content hash is already indexed"""
+        with self.db.read() as conn:
+            row = conn.execute(
+                "SELECT 1 FROM document_chunks WHERE file_hash = ? LIMIT 1",
+                (file_hash,),
+            ).fetchone()
+        return row is not None
+
+    def existing_chunks(self, chunk_ids: Iterable[str]) -> Set[str]:
+        """Return which of the given chunks are already stored"""
+        chunk_ids = list(chunk_ids)
+        placeholders = ", ".join("?" * len(chunk_ids))
+        with self.db.read() as conn:
+            rows = conn.execute(
+                f"SELECT id FROM chunks WHERE id IN ({placeholders})", chunk_ids
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def add_chunks(self, chunks: List[Tuple[str, str]]):
+        """
+        Store and full-text index chunks. Chunks already stored are skipped.
+
+        Args:
+            chunks: Tuples of (chunk_id, chunk_text)
+        """
+        self.db.execute_write(
+            lambda conn: conn.executemany(
+                "INSERT INTO chunks (id, content) VALUES (?, ?) ON CONFLICT (id) DO NOTHING",
+                chunks,
+            )
+        )
+
+    def set_document(
+        self,
+        file_path: str,
+        file_name: str,
+        file_hash: str,
+        chunk_ids: List[str] | None = None,
+        size: int | None = None,
+        ingested_at: datetime | None = None,
+        in_use: AbstractSet[str] = frozenset(),
+    ) -> List[str]:
+        """
+        Record that a path holds a document, replacing what it held before.
+
+        Args:
+            file_path: Path of the document
+            file_name: The document's file name, returned with search results
+            file_hash: Hash of the document's content
+            chunk_ids: The document's chunks in order. None if a document with the
+                      same content is already indexed.
+            size: Size of the file in bytes
+            ingested_at: When the document was added
+            in_use: Chunks that documents still being added rely on, kept even if
+                   no document uses them
+
+        Returns:
+            IDs of chunks that are no longer used by any document, to be deleted
+            from the vector store
+        """
+
+        def write(conn: sqlite3.Connection) -> List[str]:
+            old_hash = self._replace_path(conn, file_path, file_hash)
+            if chunk_ids is not None:
+                conn.execute(
+                    "DELETE FROM document_chunks WHERE file_hash = ?", (file_hash,)
+                )
+                conn.executemany(
+                    "INSERT INTO document_chunks (file_hash, chunk_index, chunk_id) VALUES (?, ?, ?)",
+                    [
+                        (file_hash, chunk_index, chunk_id)
+                        for chunk_index, chunk_id in enumerate(chunk_ids)
+                    ],
+                )
+                chunk_count = len(chunk_ids)
+            else:
+                chunk_count = conn.execute(
+                    "SELECT COUNT(*) FROM document_chunks WHERE file_hash = ?",
+                    (file_hash,),
+                ).fetchone()[0]
+
+            conn.execute(
+                """
+                INSERT INTO documents
+                    (file_path, file_name, file_hash, chunk_count, size, ingested_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    file_path,
+                    file_name,
+                    file_hash,
+                    chunk_count,
+                    size,
+                    ingested_at.isoformat() if ingested_at is not None else None,
+                ),
+            )
+            return self._release_content(conn, old_hash, in_use)
+
+        return self.db.execute_write(write)
+
+    def remove_document(
+        self, file_path: str, in_use: AbstractSet[str] = frozenset()
+    ) -> List[str] | None:
+        """
+        Remove a document.
+
+        Args:
+            file_path: Path of the document
+            in_use: Chunks that documents still being added rely on, kept even if
+                   no document uses them
+
+        Returns:
+            IDs of chunks that are no longer used by any document, to be deleted
+            from the vector store, or None if the document wasn't found
+        """
+
+        def write(conn: sqlite3.Connection) -> List[str] | None:
+            row = conn.execute(
+                "SELECT file_hash FROM documents WHERE file_path = ?", (file_path,)
+            ).fetchone()
+            if row is None:
+                return None
+            return self._release_content(
+                conn, self._replace_path(conn, file_path, None), in_use
+            )
+
+        return self.db.execute_write(write)
+
+    def remove_unused_chunks(
+        self, chunk_ids: Iterable[str], in_use: AbstractSet[str] = frozenset()
+    ) -> List[str]:
+        """
+        Delete the given chunks if no document uses them, e.g. after a failed add.
+
+        Args:
+            chunk_ids: The chunks to delete
+            in_use: Chunks that documents still being added rely on, never deleted
+
+        Returns:
+            IDs of the chunks that were deleted
+        """
+        chunk_ids = list(chunk_ids)
+        return self.db.execute_write(
+            lambda conn: self._delete_unused_chunks(conn, chunk_ids, in_use)
+        )
+
+    def _replace_path(
+        self, conn: sqlite3.Connection, file_path: str, new_hash: str | None
+    ) -> str | None:
+        """Delete a path's document row, returning its old hash if it changed"""
+        row = conn.execute(
+            "SELECT file_hash FROM documents WHERE file_path = ?", (file_path,)
+        ).fetchone()
+        conn.execute("DELETE FROM documents WHERE file_path = ?", (file_path,))
+        if row is None or row[0] == new_hash:
+            return None
+        return row[0]
+
+    def _release_content(
+        self,
+        conn: sqlite3.Connection,
+        file_hash: str | None,
+        in_use: AbstractSet[str],
+    ) -> List[str]:
+        """Delete a content hash's chunk list and chunks once no path uses it"""
+        if file_hash is None:
+            return []
+
+        still_added = conn.execute(
+            "SELECT 1 FROM documents WHERE file_hash = ? LIMIT 1", (file_hash,)
+        ).fetchone()
+        if still_added is not None:
+            return []
+
+        chunk_ids = [
+            row[0]
+            for row in conn.execute(
+                "SELECT chunk_id FROM document_chunks WHERE file_hash = ?",
+                (file_hash,),
+            )
+        ]
+        conn.execute("DELETE FROM document_chunks WHERE file_hash = ?", (file_hash,))
+        return self._delete_unused_chunks(conn, chunk_ids, in_use)
+
+    def _delete_unused_chunks(
+        self,
+        conn: sqlite3.Connection,
+        chunk_ids: List[str],
+        in_use: AbstractSet[str],
+    ) -> List[str]:
+        unused = [
+            chunk_id
+            for chunk_id in dict.fromkeys(chunk_ids)
+            if chunk_id not in in_use
+            and conn.execute(
+                "SELECT 1 FROM document_chunks WHERE chunk_id = ? LIMIT 1",
+                (chunk_id,),
+            ).fetchone()
+            is None
+        ]
+        conn.executemany(
+            "DELETE FROM chunks WHERE id = ?", [(chunk_id,) for chunk_id in unused]
+        )
+        return unused
+
+    def count_documents(self) -> int:
+        """Return the number of documents"""
+        with self.db.read() as conn:
+            return conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def list_documents(self) -> List[Document]:
+        """List all documents in the catalog, by file name"""
+        with self.db.read() as conn:
+            rows = conn.execute("""
+                SELECT file_path, file_name, file_hash, chunk_count, size, ingested_at
+                FROM documents
+                ORDER BY file_name
+            """).fetchall()
+
+        return [
+            Document(
+                file_path=row["file_path"],
+                file_name=row["file_name"],
+                file_hash=row["file_hash"],
+                chunk_count=row["chunk_count"],
+                size=row["size"],
+                ingested_at=datetime.fromisoformat(row["ingested_at"])
+                if row["ingested_at"] is not None
+                else None,
+            )
+            for row in rows
+        ]
+
+    def file_names(self, chunk_ids: Iterable[str]) -> Dict[str, str]:
+        """
+        Return the name of a document each chunk belongs to.
+
+        Chunks that no document uses are left out.
+        """
+        chunk_ids = list(chunk_ids)
+        placeholders = ", ".join("?" * len(chunk_ids))
+        with self.db.read() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT document_chunks.chunk_id, MIN(documents.file_name)
+                FROM document_chunks
+                JOIN documents USING (file_hash)
+                WHERE document_chunks.chunk_id IN ({placeholders})
+                GROUP BY document_chunks.chunk_id
+                """,
+                chunk_ids,
+            ).fetchall()
+        return {chunk_id: file_name for chunk_id, file_name in rows}
+
+    def sample_chunks(self, limit: int) -> List[str]:
+        """Return the text of up to limit stored chunks"""
+        with self.db.read() as conn:
+            rows = conn.execute(
+                "SELECT content FROM chunks LIMIT ?", (limit,)
+            ).fetchall()
+        return [content for (content,) in rows]
+
+    def search(self, query: str, limit: int = 20) -> List[Tuple[str, str]]:
+        """
+        Find the chunks that best match the words of a query, ranked by BM25.
+
+        Any word can match, so exact identifiers, part numbers and error codes are
+        found even when the rest of the query isn't in the chunk.
+
+        Args:
+            query: The search query. FTS5 syntax is not interpreted.
+            limit: Maximum number of chunks to return
+
+        Returns:
+            List of tuples: (chunk_id, chunk_text), best match first
+        """
+        # Quote each word so characters like - or " aren't parsed as FTS5 operators
+        match = " OR ".join(
+            '"' + word.replace('"', '""') + '"' for word in query.split()
+        )
+        if not match:
+            return []
+
+        with self.db.read() as conn:
+            rows = conn.execute(
+                """
+                SELECT chunks.id, chunks.content
+                FROM chunks_fts
+                JOIN chunks ON chunks.rowid = chunks_fts.rowid
+                WHERE chunks_fts MATCH ?
+                ORDER BY chunks_fts.rank
+                LIMIT ?
+                """,
+                (match, limit),
+            ).fetchall()
+
+        return [(chunk_id, content) for chunk_id, content in rows]
@@ -1,117 +1,483 @@
+import glob
 import hashlib
+import multiprocessing
 import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from datetime import datetime
 from pathlib import Path
-from typing import List, Tuple
+from typing import Callable, Dict, Iterator, List, Tuple
 
-import chromadb
-from pypdf import PdfReader
+from open_terminalui._models import Document
+from open_terminalui.document_index import DocumentIndex
+from open_terminalui.document_pipeline import iter_batches, iter_chunks, iter_pages
+from open_terminalui.embeddings import text_hash
+from open_terminalui.vector_store import VectorStore, get_vector_store
+
+
+def reciprocal_rank_fusion(rankings: List[List[str]], k: int = 60) -> Dict[str, float]:
+    """
+    Combine rankings of the same items from different retrievers.
+
+    Each item scores 1 / (k + rank) in every ranking it appears in, so items ranked
+    well by several retrievers come first, without comparing their raw scores.
+
+    Args:
+        rankings: Lists of item IDs, best first
+        k: Dampens the weight of the top ranks (60 is the value from the RRF paper)
+
+    Returns:
+        Dict mapping each item ID to its fused score, higher is better
+    """
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, item_id in enumerate(ranking, start=1):
+            scores[item_id] = scores.get(item_id, 0.0) + 1 / (k + rank)
+    return scores
+
+
+def find_documents(pattern: str) -> List[str]:
+    """
+    Expand a path into the PDF files it refers to.
+
+    Args:
+        pattern: A PDF file, a directory (searched recursively) or a glob such as
+                ~/papers/**/*.pdf
+
+    Returns:
+        Absolute paths of the PDF files, sorted
+    """
+    path = os.path.expanduser(pattern)
+
+    if os.path.isdir(path):
+        matches = glob.glob(
+            os.path.join(glob.escape(path), "**", "*.[pP][dD][fF]"), recursive=True
+        )
+    elif any(char in path for char in "*?["):
+        matches = [
+            match
+            for match in glob.glob(path, recursive=True)
+            if match.lower().endswith(".pdf")
+        ]
+    else:
+        # A single file, validated when it's added
+        return [os.path.abspath(path)]
+
+    return sorted(os.path.abspath(match) for match in matches if os.path.isfile(match))
+
+
+class IngestCancelled(Exception):
+    """Raised inside add_document when ingestion is cancelled"""
+
+
+@dataclass
+class IngestProgress:
+    """Progress of adding many documents"""
+
+    total: int  # Files to add
+    done: int = 0  # Files finished, whatever the outcome
+    added: int = 0
+    skipped: int = 0  # Unchanged since they were added
+    failed: int = 0
+    cancelled: int = 0
+    chunks: int = 0  # Chunks extracted from the added files
+    elapsed: float = 0.0  # Seconds since the start
+    message: str = ""  # Message of the last finished file
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def files_per_second(self) -> float:
+        return self.done / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def chunks_per_second(self) -> float:
+        return self.chunks / self.elapsed if self.elapsed else 0.0
+
+    def status(self) -> str:
+        """One line of live progress"""
+        return (
+            f"{self.done}/{self.total} files, {self.files_per_second:.1f} files/s, "
+            f"{self.chunks_per_second:.1f} chunks/s"
+        )
+
+    def summary(self) -> str:
+        """What was done, for when adding has finished"""
+        summary = (
+            f"Added {self.added}, skipped {self.skipped} unchanged, "
+            f"{self.failed} failed"
+        )
+        if self.cancelled:
+            summary += f", {self.cancelled} cancelled"
+        summary += (
+            f" in {self.elapsed:.1f}s ({self.files_per_second:.1f} files/s, "
+            f"{self.chunks_per_second:.1f} chunks/s)"
+        )
+        if self.errors:
+            summary += f". {self.errors[0]}"
+        return summary
 
 
 class DocumentManager:
     """Manages PDF documents and their vector embeddings using ChromaDB"""
 
-    def __init__(self, storage_path: str | None = None):
-        """Initialize the document manager with ChromaDB client"""
-        if storage_path is None:
-            # Default to ~/.open-terminalui/chroma_db
-            app_dir = Path.home() / ".open-terminalui"
-            app_dir.mkdir(exist_ok=True)
-            storage_path = str(app_dir / "chroma_db")
+    def __init__(
+        self,
+        storage_path: str | None = None,
+        vector_store: VectorStore | None = None,
+        index_path: str | None = None,
+        max_workers: int | None = None,
+        batch_size: int | None = None,
+    ):
+        """
+        Initialize the document manager with the shared ChromaDB store.
 
-        self.storage_path = storage_path
-        self.client = chromadb.PersistentClient(path=storage_path)
+        Args:
+            storage_path: Path to the ChromaDB directory. If None, defaults to
+                         ~/.open-terminalui/chroma_db
+            vector_store: Store to use instead of the shared one for storage_path
+            index_path: Path to the SQLite catalog and full-text index of the chunks.
+                       If None, defaults to documents.db next to the ChromaDB
+                       directory, suffixed with the embedding model unless it's the
+                       default one
+            max_workers: Number of processes extracting PDF pages. If None, uses the
+                        number of CPUs.
+            batch_size: Number of chunks embedded and stored at a time. If None, uses
+                       the embedding backend's batch size.
+        """
+        self.vector_store = vector_store or get_vector_store(storage_path)
+        self.storage_path = self.vector_store.storage_path
+        self.client = self.vector_store.client
+        self.embedder = self.vector_store.embedder
 
         # Get or create the documents collection
-        self.collection = self.client.get_or_create_collection(
+        self.collection = self.vector_store.get_collection(
             name="documents",
             metadata={"description": "PDF document chunks with embeddings"},
         )
 
-    def _extract_text_from_pdf(self, file_path: str) -> str:
-        """Extract text content from a PDF file"""
+        if index_path is None:
+            # The catalog lists what is in the model's collection
+            index_name = self.embedder.collection_name("documents")
+            index_path = str(Path(self.storage_path).parent / f"{index_name}.db")
+
+        self.max_workers = max_workers
+        self.batch_size = batch_size or self.embedder.batch_size
+        self._executor: ProcessPoolExecutor | None = None
+        self._executor_lock = threading.Lock()
+
+        # Chunks that documents being added rely on, with the number of documents.
+        # Checking for existing chunks and deleting unused ones both happen under
+        # the lock, so a chunk is never deleted after an add found it.
+        self._pending: Counter[str] = Counter()
+        self._pending_lock = threading.Lock()
+
+        self.index = DocumentIndex(index_path)
+        if self.index.count_documents() == 0 and self.collection.count() > 0:
+            self._import_legacy_documents()
+
+    def _import_legacy_documents(self, page_size: int = 1000):
+        """
+        Catalog documents added before chunks were content-addressed.
+
+        Their chunks are keyed by path and carry the document in their metadata.
+        They are cataloged under their existing IDs, so nothing is embedded again.
+        """
+        documents: Dict[str, Tuple[str, str]] = {}
+        chunk_ids: Dict[str, Dict[int, str]] = {}
+
+        offset = 0
+        while True:
+            results = self.collection.get(
+                limit=page_size, offset=offset, include=["documents", "metadatas"]
+            )
+            if not results["ids"]:
+                break
+
+            chunks = []
+            for chunk_id, chunk, metadata in zip(
+                results["ids"], results["documents"], results["metadatas"]
+            ):
+                if not metadata or "file_hash" not in metadata:
+                    continue
+                file_hash = metadata["file_hash"]
+                documents[file_hash] = (metadata["file_path"], metadata["file_name"])
+                chunk_ids.setdefault(file_hash, {})[metadata["chunk_index"]] = chunk_id
+                chunks.append((chunk_id, chunk))
+
+            self.index.add_chunks(chunks)
+            offset += page_size
+
+        for file_hash, (file_path, file_name) in documents.items():
+            ids = chunk_ids[file_hash]
+            self.index.set_document(
+                file_path, file_name, file_hash, [ids[i] for i in sorted(ids)]
+            )
+
+    def warm_up(self):
+        """Load the embedding model by embedding a throwaway query"""
+        self.embedder.warm_up()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """The page extraction pool, started on first use"""
+        with self._executor_lock:
+            if self._executor is None:
+                # In the app, the resource tracker these processes need was started
+                # before Textual replaced stderr, see entry_points.app
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    # Forking a process with running threads (the UI, workers) is unsafe
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _iter_chunks(self, file_path: str) -> Iterator[str]:
+        """Extract and chunk a PDF, yielding chunks as pages are extracted"""
         try:
-            reader = PdfReader(file_path)
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text() + "\n"
-            return text
+            pages = iter_pages(file_path, executor=self._get_executor())
+            yield from iter_chunks(pages)
         except Exception as e:
             raise ValueError(f"Failed to extract text from PDF: {str(e)}")
 
-    def _chunk_text(
-        self, text: str, chunk_size: int = 500, overlap: int = 50
-    ) -> List[str]:
-        """Split text into overlapping chunks"""
-        words = text.split()
-        chunks = []
+    def _get_file_hash(self, file_path: str) -> str:
+        """Hash the file's content, so identical files get the same identifier"""
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _get_chunk_id(self, chunk: str) -> str:
+        """Hash a chunk's text, so identical chunks are stored and embedded once"""
+        return text_hash(chunk)
+
+    def add_document(
+        self, file_path: str, cancel: threading.Event | None = None
+    ) -> Tuple[bool, str]:
+        """
+        Add a PDF document to the vector store
 
-        for i in range(0, len(words), chunk_size - overlap):
-            chunk = " ".join(words[i : i + chunk_size])
-            if chunk:
-                chunks.append(chunk)
+        Re-adding a path whose file has changed replaces the document, embedding
+        only the chunks that aren't stored yet. A file whose content was already
+        added from another path isn't processed again.
 
-        return chunks
+        Args:
+            file_path: Path to the PDF file
+            cancel: If set while the document is being added, stops without
+                   leaving any of it behind
 
-    def _get_file_hash(self, file_path: str) -> str:
-        """Generate a hash for the file to use as unique identifier"""
-        return hashlib.md5(file_path.encode()).hexdigest()
+        Returns:
+            Tuple of (success: bool, message: str)
+        """
+        outcome, message, _ = self._add_document(file_path, cancel)
+        return outcome == "added", message
+
+    def add_documents(
+        self,
+        file_paths: List[str],
+        max_workers: int | None = None,
+        progress: Callable[[IngestProgress], None] | None = None,
+        cancel: threading.Event | None = None,
+    ) -> IngestProgress:
+        """
+        Add many PDF documents, several at a time.
+
+        Files that haven't changed since they were added are skipped.
+
+        Args:
+            file_paths: Paths to the PDF files
+            max_workers: Number of documents added at a time. If None, uses up to 4,
+                        one per CPU.
+            progress: Called from the worker threads with a snapshot of the progress
+                     after each file
+            cancel: If set, stops adding documents. Documents being added are
+                   dropped, not left partially added.
 
-    def add_document(self, file_path: str) -> Tuple[bool, str]:
+        Returns:
+            The final progress
         """
-        Add a PDF document to the vector store
+        report = IngestProgress(total=len(file_paths))
+        report_lock = threading.Lock()
+        started = time.perf_counter()
+
+        def ingest(file_path: str):
+            if cancel is not None and cancel.is_set():
+                outcome, chunk_count = "cancelled", 0
+                message = f"Cancelled adding {os.path.basename(file_path)}"
+            else:
+                outcome, message, chunk_count = self._add_document(file_path, cancel)
+
+            with report_lock:
+                report.done += 1
+                report.chunks += chunk_count
+                if outcome == "added":
+                    report.added += 1
+                elif outcome == "skipped":
+                    report.skipped += 1
+                elif outcome == "failed":
+                    report.failed += 1
+                    report.errors.append(message)
+                else:
+                    report.cancelled += 1
+                report.message = message
+                report.elapsed = time.perf_counter() - started
+                snapshot = replace(report, errors=list(report.errors))
+
+            if progress is not None:
+                progress(snapshot)
+
+        max_workers = max_workers or min(4, os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers, thread_name_prefix="ingest") as executor:
+            # Consume the results so exceptions from the progress callback surface
+            list(executor.map(ingest, file_paths))
+
+        return report
+
+    def _add_document(
+        self, file_path: str, cancel: threading.Event | None = None
+    ) -> Tuple[str, str, int]:
+        """
+        Add a PDF document to the vector store.
 
         Returns:
-            Tuple of (success: bool, message: str)
+            Tuple of (outcome: "added", "skipped", "failed" or "cancelled",
+            message: str, chunks extracted: int)
         """
         # Validate file exists and is a PDF
         if not os.path.exists(file_path):
-            return False, f"File not found: {file_path}"
+            return "failed", f"File not found: {file_path}", 0
 
         if not file_path.lower().endswith(".pdf"):
-            return False, "Only PDF files are supported"
+            return "failed", "Only PDF files are supported", 0
+
+        file_name = os.path.basename(file_path)
 
         try:
+            size = os.path.getsize(file_path)
+
             # Check if document already exists
             file_hash = self._get_file_hash(file_path)
-            existing = self.collection.get(where={"file_hash": file_hash})
-
-            if existing and existing["ids"]:
-                return False, f"Document already exists: {os.path.basename(file_path)}"
-
-            # Extract text from PDF
-            text = self._extract_text_from_pdf(file_path)
-
-            if not text.strip():
-                return False, "PDF appears to be empty or contains no extractable text"
-
-            # Chunk the text
-            chunks = self._chunk_text(text)
-
-            # Generate IDs and metadata for each chunk
-            file_name = os.path.basename(file_path)
-            ids = [f"{file_hash}_chunk_{i}" for i in range(len(chunks))]
-            metadatas = [
-                {
-                    "file_path": file_path,
-                    "file_name": file_name,
-                    "file_hash": file_hash,
-                    "chunk_index": i,
-                    "total_chunks": len(chunks),
-                }
-                for i in range(len(chunks))
-            ]
-
-            # Add to ChromaDB (it will automatically generate embeddings)
-            self.collection.add(
-                documents=chunks,
-                ids=ids,
-                metadatas=metadatas,
+            if self.index.get_document_hash(file_path) == file_hash:
+                return "skipped", f"Document already exists: {file_name}", 0
+
+            with self._pending_lock:
+                if self.index.has_content(file_hash):
+                    # Same content as a document added from another path
+                    self._delete_vectors(
+                        self.index.set_document(
+                            file_path,
+                            file_name,
+                            file_hash,
+                            size=size,
+                            ingested_at=datetime.now(),
+                            in_use=set(self._pending),
+                        )
+                    )
+                    return (
+                        "added",
+                        f"Added {file_name}, its content was already indexed",
+                        0,
+                    )
+
+            chunk_ids: List[str] = []
+            added_ids: List[str] = []
+
+            try:
+                # Embed and store chunks a batch at a time while pages are extracted
+                for chunks in iter_batches(
+                    self._iter_chunks(file_path), self.batch_size
+                ):
+                    if cancel is not None and cancel.is_set():
+                        raise IngestCancelled(f"Cancelled adding {file_name}")
+
+                    ids = [self._get_chunk_id(chunk) for chunk in chunks]
+                    chunk_ids += ids
+
+                    with self._pending_lock:
+                        # Claim the chunks before checking, so they aren't deleted
+                        # by another document's cleanup once found
+                        self._pending.update(ids)
+                        existing = self.index.existing_chunks(ids)
+
+                    # Only embed chunks that aren't stored yet
+                    new_chunks = {
+                        chunk_id: chunk
+                        for chunk_id, chunk in zip(ids, chunks)
+                        if chunk_id not in existing
+                    }
+                    if not new_chunks:
+                        continue
+
+                    # Add to ChromaDB, embedding only text the cache hasn't seen
+                    texts = list(new_chunks.values())
+                    embeddings = self.embedder.embed(texts)
+                    with self.vector_store.write_lock:
+                        self.collection.upsert(
+                            documents=texts,
+                            embeddings=embeddings,
+                            ids=list(new_chunks),
+                        )
+                    added_ids += new_chunks
+                    self.index.add_chunks(list(new_chunks.items()))
+
+                if not chunk_ids:
+                    return (
+                        "failed",
+                        "PDF appears to be empty or contains no extractable text",
+                        0,
+                    )
+
+                with self._pending_lock:
+                    # Chunks only the previous version of the file used
+                    self._delete_vectors(
+                        self.index.set_document(
+                            file_path,
+                            file_name,
+                            file_hash,
+                            chunk_ids,
+                            size=size,
+                            ingested_at=datetime.now(),
+                            in_use=set(self._pending),
+                        )
+                    )
+                    self._release_pending(chunk_ids)
+            except BaseException:
+                # Don't leave chunks of a partial document behind
+                with self._pending_lock:
+                    self._release_pending(chunk_ids)
+                    self._delete_vectors(
+                        self.index.remove_unused_chunks(
+                            chunk_ids, in_use=set(self._pending)
+                        )
+                    )
+                raise
+
+            return (
+                "added",
+                f"Successfully added {len(chunk_ids)} chunks from {file_name} "
+                f"({len(added_ids)} embedded)",
+                len(chunk_ids),
             )
 
-            return True, f"Successfully added {len(chunks)} chunks from {file_name}"
-
+        except IngestCancelled as e:
+            return "cancelled", str(e), 0
         except Exception as e:
-            return False, f"Error adding document: {str(e)}"
+            return "failed", f"Error adding document: {str(e)}", 0
+
+    def _release_pending(self, chunk_ids: List[str]):
+        """Drop a document's claim on its chunks. Call with _pending_lock held."""
+        self._pending.subtract(chunk_ids)
+        for chunk_id in set(chunk_ids):
+            if self._pending[chunk_id] <= 0:
+                del self._pending[chunk_id]
+
+    def _delete_vectors(self, chunk_ids: List[str], batch_size: int = 1000):
+        """Delete chunks from the vector store"""
+        for start in range(0, len(chunk_ids), batch_size):
+            with self.vector_store.write_lock:
+                self.collection.delete(ids=chunk_ids[start : start + batch_size])
 
     def remove_document(self, file_path: str) -> Tuple[bool, str]:
         """
@@ -121,95 +487,84 @@ class DocumentManager:
             Tuple of (success: bool, message: str)
         """
         try:
-            file_hash = self._get_file_hash(file_path)
+            with self._pending_lock:
+                unused_ids = self.index.remove_document(
+                    file_path, in_use=set(self._pending)
+                )
+                if unused_ids is None:
+                    return False, f"Document not found: {os.path.basename(file_path)}"
 
-            # Get all chunks for this document
-            results = self.collection.get(where={"file_hash": file_hash})
-
-            if not results["ids"]:
-                return False, f"Document not found: {os.path.basename(file_path)}"
-
-            # Delete all chunks
-            self.collection.delete(ids=results["ids"])
+                # Delete the chunks no other document uses
+                self._delete_vectors(unused_ids)
 
             return True, f"Successfully removed {os.path.basename(file_path)}"
 
         except Exception as e:
             return False, f"Error removing document: {str(e)}"
 
-    def list_documents(self) -> List[Tuple[str, str, int]]:
+    def list_documents(self) -> List[Document]:
         """
         List all documents in the vector store
 
+        Reads only the catalog, not the chunks.
+
         Returns:
-            List of tuples: (file_path, file_name, num_chunks)
+            The documents, by file name
         """
         try:
-            # Get all documents
-            results = self.collection.get()
-
-            if not results["metadatas"]:
-                return []
-
-            # Group by file_hash to get unique documents
-            docs_by_hash = {}
-            for metadata in results["metadatas"]:
-                file_hash = metadata["file_hash"]
-                if file_hash not in docs_by_hash:
-                    docs_by_hash[file_hash] = {
-                        "file_path": metadata["file_path"],
-                        "file_name": metadata["file_name"],
-                        "chunk_count": 0,
-                    }
-                docs_by_hash[file_hash]["chunk_count"] += 1
-
-            # Convert to list of tuples
-            return [
-                (doc["file_path"], doc["file_name"], doc["chunk_count"])
-                for doc in docs_by_hash.values()
-            ]
-
+            return self.index.list_documents()
         except Exception as _:
             return []
 
     def search_documents(
-        self, query: str, top_k: int = 5
+        self, query: str, top_k: int = 5, candidates: int = 20
     ) -> List[Tuple[str, str, float]]:
         """
-        Search for relevant document chunks using vector similarity
+        Search for relevant document chunks using hybrid retrieval
+
+        Takes the best matches by vector similarity and by full-text (BM25) search,
+        and combines the two rankings with reciprocal rank fusion. Chunks that only
+        match exact terms, such as identifiers or error codes, are still found.
 
         Args:
             query: The search query
             top_k: Number of top results to return
+            candidates: Number of results taken from each retriever before fusion
 
         Returns:
-            List of tuples: (chunk_text, file_name, similarity_score)
+            List of tuples: (chunk_text, file_name, relevance_score)
         """
         try:
+            candidates = max(candidates, top_k)
+            texts: Dict[str, Tuple[str, str]] = {}
+
             results = self.collection.query(
-                query_texts=[query],
-                n_results=top_k,
+                query_embeddings=self.embedder.embed([query]),
+                n_results=candidates,
             )
+            vector_ids = results["ids"][0] if results["ids"] else []
+            documents = results["documents"][0] if results["documents"] else []
+            lexical = self.index.search(query, limit=candidates)
+            lexical_ids = [chunk_id for chunk_id, _ in lexical]
+
+            # Chunks are shared between documents, the catalog knows which they're in
+            file_names = self.index.file_names(vector_ids + lexical_ids)
+            for chunk_id, doc in [*zip(vector_ids, documents), *lexical]:
+                if chunk_id in file_names:
+                    texts.setdefault(chunk_id, (doc, file_names[chunk_id]))
+
+            scores = reciprocal_rank_fusion(
+                [
+                    [chunk_id for chunk_id in vector_ids if chunk_id in texts],
+                    [chunk_id for chunk_id in lexical_ids if chunk_id in texts],
+                ]
+            )
+            ranked = sorted(scores, key=scores.__getitem__, reverse=True)[:top_k]
 
-            if not results["documents"] or not results["documents"][0]:
-                return []
-
-            chunks = []
-            documents = results["documents"][0]
-            metadatas = results["metadatas"][0] if results["metadatas"] else []
-            distances = results["distances"][0] if results["distances"] else []
-
-            for i, doc in enumerate(documents):
-                if i < len(metadatas):
-                    metadata = metadatas[i]
-                    # ChromaDB returns distances, lower is better
-                    # Convert to similarity score (1 - normalized_distance)
-                    distance = distances[i] if i < len(distances) else 0
-                    similarity = max(0, 1 - distance)
-
-                    chunks.append((doc, metadata["file_name"], similarity))
-
-            return chunks
+            return [
+                (texts[chunk_id][0], texts[chunk_id][1], scores[chunk_id])
+                for chunk_id in ranked
+            ]
 
         except Exception as _:
             return []
@@ -0,0 +1,143 @@
+from collections import deque
+from concurrent.futures import Executor, Future
+from typing import Deque, Iterable, Iterator, List
+
+from pypdf import PdfReader
+
+# Kept free of heavy imports: worker processes import this module to extract pages
+
+
+def count_pages(file_path: str) -> int:
+    """Return the number of pages in a PDF"""
+    return len(PdfReader(file_path).pages)
+
+
+def extract_pages(file_path: str, start: int, stop: int) -> List[str]:
+    """
+    Extract the text of a range of pages. Runs in a worker process.
+
+    Args:
+        file_path: Path to the PDF file
+        start: Index of the first page
+        stop: Index after the last page
+
+    Returns:
+        The text of each page
+    """
+    reader = PdfReader(file_path)
+    return [reader.pages[i].extract_text() for i in range(start, stop)]
+
+
+def iter_pages(
+    file_path: str,
+    executor: Executor | None = None,
+    pages_per_task: int = 8,
+    max_pending: int = 8,
+) -> Iterator[str]:
+    """
+    Extract a PDF's pages in parallel, yielding their text in page order.
+
+    Only max_pending tasks are in flight at a time, so memory use doesn't grow with
+    the number of pages.
+
+    Args:
+        file_path: Path to the PDF file
+        executor: Pool to extract pages in. If None, or if the PDF fits in one task,
+                 pages are extracted in this process.
+        pages_per_task: Number of pages extracted per task
+        max_pending: Most tasks submitted ahead of the page being yielded
+
+    Yields:
+        The text of each page
+    """
+    page_count = count_pages(file_path)
+
+    if executor is None or page_count <= pages_per_task:
+        for start in range(0, page_count, pages_per_task):
+            yield from extract_pages(
+                file_path, start, min(start + pages_per_task, page_count)
+            )
+        return
+
+    starts = iter(range(0, page_count, pages_per_task))
+    pending: Deque[Future[List[str]]] = deque()
+
+    def submit_next() -> None:
+        start = next(starts, None)
+        if start is not None:
+            pending.append(
+                executor.submit(
+                    extract_pages,
+                    file_path,
+                    start,
+                    min(start + pages_per_task, page_count),
+                )
+            )
+
+    for _ in range(max_pending):
+        submit_next()
+
+    try:
+        while pending:
+            pages = pending.popleft().result()
+            submit_next()
+            yield from pages
+    finally:
+        # Stopped early, e.g. because embedding failed
+        for future in pending:
+            future.cancel()
+
+
+class Chunker:
+    """
+    Splits a stream of text into overlapping chunks of words as it arrives.
+
+    Produces the same chunks as splitting the whole text at once, while only ever
+    holding one chunk's worth of words.
+    """
+
+    def __init__(self, chunk_size: int = 500, overlap: int = 50):
+        """
+        Args:
+            chunk_size: Number of words per chunk
+            overlap: Number of words shared by consecutive chunks
+        """
+        self.chunk_size = chunk_size
+        self.overlap = overlap
+        self._words: List[str] = []
+
+    def feed(self, text: str) -> Iterator[str]:
+        """Add text, yielding every chunk that is now complete"""
+        self._words.extend(text.split())
+
+        while len(self._words) >= self.chunk_size:
+            yield " ".join(self._words[: self.chunk_size])
+            del self._words[: self.chunk_size - self.overlap]
+
+    def finish(self) -> Iterator[str]:
+        """Yield the chunks that start in the remaining words"""
+        while self._words:
+            yield " ".join(self._words[: self.chunk_size])
+            del self._words[: self.chunk_size - self.overlap]
+
+
+def iter_chunks(
+    pages: Iterable[str], chunk_size: int = 500, overlap: int = 50
+) -> Iterator[str]:
+    """Chunk pages of text as they arrive"""
+    chunker = Chunker(chunk_size, overlap)
+    for page in pages:
+        yield from chunker.feed(page)
+    yield from chunker.finish()
+
+
+def iter_batches(items: Iterable[str], batch_size: int) -> Iterator[List[str]]:
+    """Group items into lists of batch_size, the last one possibly shorter"""
+    batch: List[str] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -0,0 +1,337 @@
+import hashlib
+import os
+import re
+import sqlite3
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Sequence
+
+import numpy as np
+from chromadb.utils.embedding_functions.onnx_mini_lm_l6_v2 import ONNXMiniLM_L6_V2
+
+from open_terminalui.database import Database
+from open_terminalui.ollama_client import OllamaClient, get_ollama_client
+
+# Name under which the default model's embeddings are cached
+DEFAULT_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+EMBEDDING_BACKENDS = ("onnx", "ollama")
+
+Embedding = Sequence[float] | np.ndarray
+EmbeddingFunction = Callable[[List[str]], Sequence[Embedding]]
+
+
+def text_hash(text: str) -> str:
+    """Hash a text, the key its embeddings are cached under"""
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def _env_int(name: str) -> int | None:
+    value = os.environ.get(name)
+    return int(value) if value else None
+
+
+@dataclass
+class EmbeddingSettings:
+    # "onnx" runs all-MiniLM-L6-v2 locally, "ollama" uses /api/embed
+    backend: str = "onnx"
+    # Model used by the ollama backend
+    ollama_model: str = "nomic-embed-text"
+    # Texts per model call, None uses the backend's default
+    batch_size: int | None = None
+    # CPU threads of the onnx backend, None uses all cores
+    num_threads: int | None = None
+
+    @classmethod
+    def from_env(cls) -> "EmbeddingSettings":
+        """
+        Read settings from environment variables, falling back to the defaults.
+
+        Reads OPEN_TERMINALUI_EMBEDDING_BACKEND, OPEN_TERMINALUI_EMBEDDING_MODEL,
+        OPEN_TERMINALUI_EMBEDDING_BATCH_SIZE and OPEN_TERMINALUI_EMBEDDING_THREADS.
+        """
+        defaults = cls()
+        return cls(
+            backend=os.environ.get("OPEN_TERMINALUI_EMBEDDING_BACKEND")
+            or defaults.backend,
+            ollama_model=os.environ.get("OPEN_TERMINALUI_EMBEDDING_MODEL")
+            or defaults.ollama_model,
+            batch_size=_env_int("OPEN_TERMINALUI_EMBEDDING_BATCH_SIZE")
+            or defaults.batch_size,
+            num_threads=_env_int("OPEN_TERMINALUI_EMBEDDING_THREADS")
+            or defaults.num_threads,
+        )
+
+
+class OnnxEmbeddingFunction(ONNXMiniLM_L6_V2):
+    """
+    ChromaDB's default model, all-MiniLM-L6-v2, run on the CPU with ONNX Runtime.
+
+    Unlike ChromaDB's default embedding function, the session is loaded once and
+    the batch size and thread count can be set. That relies on the internals of
+    ChromaDB's class (model, _forward and _download_model_if_not_exists), so the
+    chromadb dependency is pinned to the versions this was checked against.
+    """
+
+    def __init__(self, batch_size: int = 64, num_threads: int | None = None):
+        """
+        Args:
+            batch_size: Texts per model call
+            num_threads: Threads used within each model call. If None, ONNX Runtime
+                        uses one per core.
+        """
+        super().__init__()
+        self.batch_size = batch_size
+        self.num_threads = num_threads
+
+    @cached_property
+    def model(self) -> Any:
+        options = self.ort.SessionOptions()
+        options.log_severity_level = 3
+        options.graph_optimization_level = (
+            self.ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        )
+        if self.num_threads is not None:
+            options.intra_op_num_threads = self.num_threads
+
+        # CoreML is slower than the CPU provider for this model
+        providers = [
+            provider
+            for provider in self.ort.get_available_providers()
+            if provider != "CoreMLExecutionProvider"
+        ]
+        return self.ort.InferenceSession(
+            os.path.join(self.DOWNLOAD_PATH, self.EXTRACTED_FOLDER_NAME, "model.onnx"),
+            providers=providers,
+            sess_options=options,
+        )
+
+    def __call__(self, input: List[str]) -> List[np.ndarray]:
+        # Only download the model when it is actually used
+        self._download_model_if_not_exists()
+        return list(self._forward(list(input), batch_size=self.batch_size))
+
+
+class OllamaEmbeddingFunction:
+    """An embedding model served by Ollama, sent many texts per request"""
+
+    def __init__(
+        self,
+        model: str,
+        batch_size: int = 256,
+        ollama_client: OllamaClient | None = None,
+    ):
+        """
+        Args:
+            model: The Ollama embedding model
+            batch_size: Texts per request
+            ollama_client: Client to send requests with. If None, uses the shared
+                          client.
+        """
+        self.model = model
+        self.batch_size = batch_size
+        self.ollama_client = ollama_client or get_ollama_client()
+
+    def __call__(self, input: List[str]) -> List[Sequence[float]]:
+        embeddings: List[Sequence[float]] = []
+        for start in range(0, len(input), self.batch_size):
+            embeddings += self.ollama_client.embed(
+                input[start : start + self.batch_size], model=self.model
+            )
+        return embeddings
+
+
+class EmbeddingCache:
+    """Embeddings stored on disk, keyed by the model and a hash of the text"""
+
+    def __init__(self, db_path: str, max_variables: int = 500):
+        """
+        Open the cache, creating it if needed.
+
+        Args:
+            db_path: Path to the SQLite database file
+            max_variables: Most hashes looked up in one query
+        """
+        self.db_path = db_path
+        self.max_variables = max_variables
+        self.db = Database(db_path)
+        self.db.execute_write(self._init_db)
+
+    def _init_db(self, conn: sqlite3.Connection):
+        """
+        Initialize the database schema.
+
+        Creates the embeddings table, which stores each vector as float32 bytes.
+        """
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                PRIMARY KEY (model, text_hash)
+            ) WITHOUT ROWID
+        """)
+
+    def get(self, model: str, text_hashes: Iterable[str]) -> Dict[str, np.ndarray]:
+        """
+        Look up cached embeddings.
+
+        Args:
+            model: The model the embeddings were computed with
+            text_hashes: Hashes of the texts
+
+        Returns:
+            Dict mapping each cached hash to its embedding. Misses are left out.
+        """
+        text_hashes = list(text_hashes)
+        embeddings: Dict[str, np.ndarray] = {}
+
+        with self.db.read() as conn:
+            for start in range(0, len(text_hashes), self.max_variables):
+                batch = text_hashes[start : start + self.max_variables]
+                placeholders = ", ".join("?" * len(batch))
+                rows = conn.execute(
+                    f"""
+                    SELECT text_hash, vector FROM embeddings
+                    WHERE model = ? AND text_hash IN ({placeholders})
+                    """,
+                    [model, *batch],
+                )
+                for hash_, vector in rows:
+                    embeddings[hash_] = np.frombuffer(vector, dtype=np.float32)
+
+        return embeddings
+
+    def put(self, model: str, embeddings: Mapping[str, Embedding]):
+        """
+        Store embeddings.
+
+        Args:
+            model: The model the embeddings were computed with
+            embeddings: Dict mapping text hashes to embeddings
+        """
+        rows = [
+            (model, hash_, np.asarray(vector, dtype=np.float32).tobytes())
+            for hash_, vector in embeddings.items()
+        ]
+        self.db.execute_write(
+            lambda conn: conn.executemany(
+                """
+                INSERT INTO embeddings (model, text_hash, vector) VALUES (?, ?, ?)
+                ON CONFLICT (model, text_hash) DO NOTHING
+                """,
+                rows,
+            )
+        )
+
+
+class Embedder:
+    """
+    Computes embeddings with a model, reusing cached ones.
+
+    Only texts that aren't in the cache are sent to the model, in one batch. The
+    vector store is given the embeddings explicitly instead of computing them
+    itself, so re-adding text or rebuilding a collection doesn't run the model.
+    """
+
+    def __init__(
+        self,
+        embedding_function: EmbeddingFunction,
+        model: str,
+        cache: EmbeddingCache | None = None,
+        batch_size: int = 64,
+    ):
+        """
+        Args:
+            embedding_function: Computes the embeddings of a list of texts
+            model: Name of the model, embeddings are cached per model
+            cache: Where embeddings are cached. If None, nothing is cached.
+            batch_size: Number of texts callers should embed at a time
+        """
+        self.embedding_function = embedding_function
+        self.model = model
+        self.cache = cache
+        self.batch_size = batch_size
+
+    @classmethod
+    def from_settings(
+        cls,
+        settings: EmbeddingSettings | None = None,
+        cache: EmbeddingCache | None = None,
+    ) -> "Embedder":
+        """
+        Create the embedder for the configured backend.
+
+        Args:
+            settings: Backend settings. If None, reads them from the environment.
+            cache: Where embeddings are cached. If None, nothing is cached.
+        """
+        settings = settings or EmbeddingSettings.from_env()
+
+        if settings.backend == "onnx":
+            batch_size = settings.batch_size or 64
+            return cls(
+                OnnxEmbeddingFunction(batch_size, settings.num_threads),
+                DEFAULT_EMBEDDING_MODEL,
+                cache,
+                batch_size,
+            )
+        if settings.backend == "ollama":
+            batch_size = settings.batch_size or 256
+            return cls(
+                OllamaEmbeddingFunction(settings.ollama_model, batch_size),
+                f"ollama/{settings.ollama_model}",
+                cache,
+                batch_size,
+            )
+
+        raise ValueError(
+            f"Unknown embedding backend {settings.backend!r}, "
+            f"expected one of {', '.join(EMBEDDING_BACKENDS)}"
+        )
+
+    def collection_name(self, name: str) -> str:
+        """
+        Name of a collection holding this model's embeddings.
+
+        Models have their own collections, since their embeddings can't be compared.
+        The default model keeps the unsuffixed names.
+        """
+        if self.model == DEFAULT_EMBEDDING_MODEL:
+            return name
+        # Collection names may only contain letters, digits, ".", "_" and "-"
+        return f"{name}-{re.sub(r'[^A-Za-z0-9._-]+', '-', self.model).strip('-._')}"
+
+    def warm_up(self):
+        """Load the model by embedding a throwaway text, bypassing the cache"""
+        self.embedding_function(["warm up"])
+
+    def embed(self, texts: List[str]) -> List[np.ndarray]:
+        """
+        Embed texts.
+
+        Args:
+            texts: The texts to embed
+
+        Returns:
+            One embedding per text, in the same order
+        """
+        hashes = [text_hash(text) for text in texts]
+        embeddings = self.cache.get(self.model, hashes) if self.cache else {}
+
+        # Each distinct text the cache doesn't have, computed in one batch
+        misses = {
+            hash_: text for hash_, text in zip(hashes, texts) if hash_ not in embeddings
+        }
+        if misses:
+            computed = {
+                hash_: np.asarray(vector, dtype=np.float32)
+                for hash_, vector in zip(
+                    misses, self.embedding_function(list(misses.values()))
+                )
+            }
+            if self.cache is not None:
+                self.cache.put(self.model, computed)
+            embeddings.update(computed)
+
+        return [embeddings[hash_] for hash_ in hashes]
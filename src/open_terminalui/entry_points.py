@@ -1,5 +1,220 @@
-from open_terminalui.app import OpenTerminalUI
+import argparse
+import threading
+import time
+from multiprocessing import resource_tracker
+
+from open_terminalui.startup_timer import StartupTimer
+
 
 def app():
-    app = OpenTerminalUI()
+    startup_timer = StartupTimer()
+
+    # Imported here so the startup timer covers the import time
+    from open_terminalui.app import OpenTerminalUI
+
+    startup_timer.mark("imports")
+    app = OpenTerminalUI(startup_timer=startup_timer)
+
+    # Page extraction processes need the resource tracker, which is started with
+    # stderr's file descriptor. Textual replaces stderr with one that has none, so
+    # the tracker is started now, on the main thread.
+    resource_tracker.ensure_running()
     app.run()
+
+
+def backfill_memory():
+    """Index every saved chat into memory and report the throughput"""
+    parser = argparse.ArgumentParser(
+        description="Summarize and index all saved chats into chat memory."
+    )
+    parser.add_argument(
+        "--batch-tokens",
+        type=int,
+        default=1536,
+        help="estimated input tokens per batched summary request (default: 1536)",
+    )
+    args = parser.parse_args()
+
+    from open_terminalui.chat_manager import ChatManager
+    from open_terminalui.memory_manager import MemoryManager
+
+    chat_manager = ChatManager()
+    memory_manager = MemoryManager()
+
+    # Load one chat at a time so memory use doesn't grow with the history
+    chats = chat_manager.list_chat_summaries()
+    started = time.perf_counter()
+    indexed = 0
+
+    for i, summary in enumerate(chats, start=1):
+        chat = chat_manager.load_chat(summary.id)
+        if chat is not None:
+            indexed += memory_manager.save_chat(chat, batch_tokens=args.batch_tokens)
+        elapsed = time.perf_counter() - started
+        print(
+            f"[{i}/{len(chats)}] chat {summary.id}: {indexed} messages indexed, "
+            f"{indexed / elapsed:.1f} messages/s",
+            flush=True,
+        )
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"Indexed {indexed} messages from {len(chats)} chats in {elapsed:.1f}s "
+        f"({indexed / elapsed if elapsed else 0:.1f} messages/s)"
+    )
+
+
+def ingest():
+    """Add every PDF in the given files, directories or globs to the documents"""
+    parser = argparse.ArgumentParser(
+        description="Add PDF documents in bulk, skipping files that haven't changed."
+    )
+    parser.add_argument(
+        "paths",
+        nargs="+",
+        help="PDF files, directories (searched recursively) or globs",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="documents added at a time (default: up to 4, one per CPU)",
+    )
+    args = parser.parse_args()
+
+    from open_terminalui.document_manager import DocumentManager, find_documents
+
+    # Each file once, even if several arguments match it
+    file_paths = list(
+        dict.fromkeys(
+            path for pattern in args.paths for path in find_documents(pattern)
+        )
+    )
+    if not file_paths:
+        print("No PDF files found")
+        return
+
+    doc_manager = DocumentManager()
+    cancel = threading.Event()
+    finished = threading.Event()
+    result = []
+
+    def show_progress(report):
+        print(f"[{report.status()}] {report.message}", flush=True)
+
+    def run():
+        try:
+            result.append(
+                doc_manager.add_documents(
+                    file_paths,
+                    max_workers=args.workers,
+                    progress=show_progress,
+                    cancel=cancel,
+                )
+            )
+        finally:
+            finished.set()
+
+    threading.Thread(target=run, daemon=True).start()
+
+    # Ctrl+C stops cleanly: documents being added are dropped, not left partial.
+    # Waits on an event, since interrupting Thread.join can break is_alive().
+    while not finished.is_set():
+        try:
+            finished.wait(0.5)
+        except KeyboardInterrupt:
+            if not cancel.is_set():
+                print("Cancelling...", flush=True)
+            cancel.set()
+
+    if result:
+        print(result[0].summary())
+
+
+def benchmark_embeddings():
+    """Report the embeddings/s of each embedding backend on the saved corpus"""
+    from open_terminalui.embeddings import EMBEDDING_BACKENDS, EmbeddingSettings
+
+    defaults = EmbeddingSettings.from_env()
+    parser = argparse.ArgumentParser(
+        description="Measure embedding throughput on your documents and chats."
+    )
+    parser.add_argument(
+        "--backend",
+        choices=EMBEDDING_BACKENDS,
+        action="append",
+        help="backend to measure, can be repeated (default: all)",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=1000,
+        help="number of texts to embed (default: 1000)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=defaults.batch_size,
+        help="texts per model call (default: the backend's default)",
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=defaults.num_threads,
+        help="CPU threads of the onnx backend (default: one per core)",
+    )
+    parser.add_argument(
+        "--ollama-model",
+        default=defaults.ollama_model,
+        help=f"model of the ollama backend (default: {defaults.ollama_model})",
+    )
+    args = parser.parse_args()
+
+    from open_terminalui.chat_manager import ChatManager
+    from open_terminalui.document_manager import DocumentManager
+    from open_terminalui.embeddings import Embedder
+
+    # Document chunks first, then chat messages, up to the limit
+    texts = DocumentManager().index.sample_chunks(args.limit)
+    chat_manager = ChatManager()
+    for summary in chat_manager.list_chat_summaries():
+        if len(texts) >= args.limit:
+            break
+        chat = chat_manager.load_chat(summary.id)
+        if chat is not None:
+            texts += [
+                message.content
+                for message in chat.messages
+                if message.role in ("user", "assistant")
+            ]
+    texts = texts[: args.limit]
+
+    if not texts:
+        print("Nothing to embed, add documents or chat first")
+        return
+
+    print(f"Embedding {len(texts)} texts")
+    for backend in args.backend or EMBEDDING_BACKENDS:
+        settings = EmbeddingSettings(
+            backend=backend,
+            ollama_model=args.ollama_model,
+            batch_size=args.batch_size,
+            num_threads=args.threads,
+        )
+        # Without a cache, so every text goes through the model
+        embedder = Embedder.from_settings(settings)
+
+        try:
+            embedder.warm_up()
+            started = time.perf_counter()
+            embedder.embedding_function(texts)
+            elapsed = time.perf_counter() - started
+        except Exception as e:
+            print(f"{backend} ({embedder.model}): failed, {e}")
+            continue
+
+        print(
+            f"{backend} ({embedder.model}, batch size {embedder.batch_size}): "
+            f"{len(texts) / elapsed:.1f} embeddings/s ({elapsed:.2f}s)",
+            flush=True,
+        )
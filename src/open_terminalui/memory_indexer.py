@@ -0,0 +1,186 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable
+
+from open_terminalui.chat_manager import ChatManager
+
+if TYPE_CHECKING:
+    from open_terminalui.memory_manager import MemoryManager
+
+
+class MemoryIndexer:
+    """
+    Indexes chats into memory on a background thread.
+
+    Jobs are keyed by chat, so saving the same chat again before its job runs only
+    pushes the job back (debouncing). Pending chat IDs are persisted to disk, so
+    jobs that didn't run before the app exited are picked up on the next start.
+    """
+
+    def __init__(
+        self,
+        chat_manager: ChatManager,
+        get_memory_manager: Callable[[], "MemoryManager"],
+        queue_path: str | None = None,
+        debounce: float = 5.0,
+        retry_delay: float = 60.0,
+        max_pending: int = 256,
+    ):
+        """
+        Initialize the indexer. Call start() to begin processing.
+
+        Args:
+            chat_manager: Used to load the latest version of each chat
+            get_memory_manager: Returns the memory manager. Called on the indexer
+                               thread, so the vector store can be opened lazily.
+            queue_path: Path of the pending jobs file. If None, defaults to
+                       ~/.open-terminalui/memory_queue.json
+            debounce: Seconds to wait after the last save of a chat before indexing it
+            retry_delay: Seconds to wait before retrying a failed job
+            max_pending: Most chats that can be waiting to be indexed
+        """
+        if queue_path is None:
+            # Default to ~/.open-terminalui/memory_queue.json
+            app_dir = Path.home() / ".open-terminalui"
+            app_dir.mkdir(exist_ok=True)
+            queue_path = str(app_dir / "memory_queue.json")
+
+        self.chat_manager = chat_manager
+        self.get_memory_manager = get_memory_manager
+        self.queue_path = queue_path
+        self.debounce = debounce
+        self.retry_delay = retry_delay
+        self.max_pending = max_pending
+
+        # Chat ID -> time.monotonic() at which the job becomes due
+        self._pending: dict[int, float] = {}
+        self._running: int | None = None
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._thread: threading.Thread | None = None
+
+        # Cleared while a response is being generated, so indexing doesn't compete
+        # with it for the model
+        self.idle = threading.Event()
+        self.idle.set()
+
+        self._load_pending()
+
+    def start(self) -> None:
+        """Start the indexer thread"""
+        if self._thread is not None:
+            return
+
+        self._thread = threading.Thread(
+            target=self._run, name="memory-indexer", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the indexer thread. Pending jobs stay on disk for the next start."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        self.idle.set()
+
+    def enqueue(self, chat_id: int) -> bool:
+        """
+        Schedule a chat to be indexed once it hasn't been saved for the debounce time.
+
+        Args:
+            chat_id: The ID of the saved chat
+
+        Returns:
+            True if the job was scheduled, False if the queue is full
+        """
+        with self._condition:
+            if chat_id not in self._pending and len(self._pending) >= self.max_pending:
+                return False
+
+            self._pending[chat_id] = time.monotonic() + self.debounce
+            self._save_pending()
+            self._condition.notify()
+        return True
+
+    def discard(self, chat_id: int) -> None:
+        """Cancel a pending job, e.g. because the chat was deleted"""
+        with self._condition:
+            if self._pending.pop(chat_id, None) is not None:
+                self._save_pending()
+
+    def pause(self) -> None:
+        """Hold off indexing while a response is being generated"""
+        self.idle.clear()
+
+    def resume(self) -> None:
+        """Allow indexing again once generation has finished"""
+        self.idle.set()
+
+    def _run(self) -> None:
+        while True:
+            chat_id = self._next_due()
+            if chat_id is None:
+                return
+
+            self.idle.wait()
+
+            try:
+                chat = self.chat_manager.load_chat(chat_id)
+                if chat is not None:
+                    self.get_memory_manager().save_chat(chat, idle=self.idle)
+            except Exception:
+                # Most likely Ollama is unavailable, try again later
+                with self._condition:
+                    self._pending.setdefault(
+                        chat_id, time.monotonic() + self.retry_delay
+                    )
+
+            with self._condition:
+                self._running = None
+                self._save_pending()
+
+    def _next_due(self) -> int | None:
+        """Block until a job is due and take it, or return None once stopped"""
+        with self._condition:
+            while not self._stopped:
+                now = time.monotonic()
+                due = [
+                    chat_id
+                    for chat_id, due_at in self._pending.items()
+                    if due_at <= now
+                ]
+                if due:
+                    chat_id = min(due, key=self._pending.__getitem__)
+                    del self._pending[chat_id]
+                    self._running = chat_id
+                    return chat_id
+
+                timeout = min(self._pending.values(), default=now + 60) - now
+                self._condition.wait(timeout=timeout)
+            return None
+
+    def _load_pending(self) -> None:
+        """Reschedule jobs that were still pending when the app last exited"""
+        try:
+            with open(self.queue_path) as f:
+                chat_ids = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        now = time.monotonic()
+        for chat_id in chat_ids[: self.max_pending]:
+            self._pending[int(chat_id)] = now + self.debounce
+
+    def _save_pending(self) -> None:
+        """Persist pending chat IDs, including a job that is currently running"""
+        chat_ids = set(self._pending)
+        # Keep the running job on disk until it's done, in case the app exits first
+        if self._running is not None:
+            chat_ids.add(self._running)
+        tmp_path = f"{self.queue_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(sorted(chat_ids), f)
+        os.replace(tmp_path, self.queue_path)
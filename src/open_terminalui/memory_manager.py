@@ -1,33 +1,98 @@
 import hashlib
+import json
+import sqlite3
+import threading
 from pathlib import Path
 from typing import List, Tuple
 
-import chromadb
-import ollama
-
 from open_terminalui._models import Chat, Message
+from open_terminalui.context_builder import estimate_tokens
+from open_terminalui.ollama_client import OllamaClient, get_ollama_client
+from open_terminalui.vector_store import VectorStore, get_vector_store
 
 
 class MemoryManager:
     """Manages chat message vector embeddings using ChromaDB"""
 
-    def __init__(self, storage_path: str | None = None):
-        """Initialize the document manager with ChromaDB client"""
-        if storage_path is None:
-            # Default to ~/.open-terminalui/chroma_db
-            app_dir = Path.home() / ".open-terminalui"
-            app_dir.mkdir(exist_ok=True)
-            storage_path = str(app_dir / "chroma_db")
+    def __init__(
+        self,
+        storage_path: str | None = None,
+        ollama_client: OllamaClient | None = None,
+        vector_store: VectorStore | None = None,
+        state_path: str | None = None,
+    ):
+        """
+        Initialize the memory manager with the shared ChromaDB store.
 
-        self.storage_path = storage_path
-        self.client = chromadb.PersistentClient(path=storage_path)
+        Args:
+            storage_path: Path to the ChromaDB directory. If None, defaults to
+                         ~/.open-terminalui/chroma_db
+            ollama_client: Client used to summarize messages. If None, uses the
+                          shared client.
+            vector_store: Store to use instead of the shared one for storage_path
+            state_path: Path to the SQLite database holding indexing progress. If
+                       None, defaults to memory_index.db next to the ChromaDB directory,
+                       suffixed with the embedding model unless it's the default one
+        """
+        self.vector_store = vector_store or get_vector_store(storage_path)
+        self.storage_path = self.vector_store.storage_path
+        self.client = self.vector_store.client
+        self.embedder = self.vector_store.embedder
+        self.ollama_client = ollama_client or get_ollama_client()
 
         # Get or create the documents collection
-        self.collection = self.client.get_or_create_collection(
+        self.collection = self.vector_store.get_collection(
             name="chat-message-summaries",
             metadata={"description": "Chat message summaries with embeddings"},
         )
 
+        if state_path is None:
+            # Progress is tracked per model, each has its own collection
+            state_name = self.embedder.collection_name("memory_index")
+            state_path = str(Path(self.storage_path).parent / f"{state_name}.db")
+
+        self.state_path = state_path
+        self._init_state_db()
+
+    def _init_state_db(self):
+        """
+        Initialize the indexing progress schema.
+
+        Creates the watermarks table, which stores for each chat the index of the last
+        message that has been indexed.
+        """
+        with sqlite3.connect(self.state_path) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS watermarks (
+                    chat_id INTEGER PRIMARY KEY,
+                    last_indexed_index INTEGER NOT NULL
+                )
+            """)
+            conn.commit()
+
+    def _get_watermark(self, chat_id: int) -> int:
+        """Return the index of the last indexed message of a chat, or -1 if none"""
+        with sqlite3.connect(self.state_path) as conn:
+            row = conn.execute(
+                "SELECT last_indexed_index FROM watermarks WHERE chat_id = ?",
+                (chat_id,),
+            ).fetchone()
+
+        return row[0] if row is not None else -1
+
+    def _set_watermark(self, chat_id: int, message_index: int):
+        """Record that every message of a chat up to message_index has been indexed"""
+        with sqlite3.connect(self.state_path) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO watermarks (chat_id, last_indexed_index) VALUES (?, ?)",
+                (chat_id, message_index),
+            )
+            conn.commit()
+
+    def warm_up(self):
+        """Load the embedding model by embedding a throwaway query"""
+        self.embedder.warm_up()
+
     def _get_chat_message_hash(self, chat_id: int, message_index: int) -> str:
         """Generate a hash for the file to use as unique identifier"""
         return hashlib.md5(f"{chat_id}-{message_index}".encode()).hexdigest()
@@ -57,9 +122,7 @@ Provide only the summary without labels:
         ollama_request = [{"role": "user", "content": prompt}]
 
         try:
-            ollama_response = ollama.chat(
-                model="llama3.2", messages=ollama_request, stream=False
-            )
+            ollama_response = self.ollama_client.summarize(ollama_request)
 
             message_summary = ollama_response.message.content
 
@@ -69,52 +132,190 @@ Provide only the summary without labels:
         except Exception as e:
             raise Exception(e)
 
-    def save_chat(self, chat: Chat):
+    def _summarize_batch(self, messages: list[Message]) -> list[str | None]:
         """
-        Save chat messages to the vector store with embeddings.
+        Summarize several messages with one structured request.
 
-        Processes each user and assistant message in the chat, summarizes them if needed,
-        and stores them in ChromaDB for semantic search. Skips messages that have already
-        been saved.
+        Falls back to summarizing one by one if the response isn't valid JSON with
+        a summary for every message.
+
+        Args:
+            messages: The messages to summarize
+
+        Returns:
+            One summary per message, in the same order
+        """
+        if len(messages) == 1:
+            return [self._summarize_message(messages[0])]
+
+        payload = json.dumps(
+            {str(i): message.content for i, message in enumerate(messages)}
+        )
+        prompt = f"""Help me build your memory by summarizing each of these messages from the user into just the facts.
+
+The messages are a JSON object keyed by message index:
+
+{payload}
+
+Respond with a JSON object with the same keys, mapping each index to the summary of that message without labels.
+"""
+
+        ollama_request = [{"role": "user", "content": prompt}]
+        ollama_response = self.ollama_client.summarize(ollama_request, format="json")
+
+        try:
+            summaries = json.loads(ollama_response.message.content or "")
+            results = [summaries[str(i)] for i in range(len(messages))]
+            if all(isinstance(summary, str) and summary for summary in results):
+                return results
+        except (ValueError, KeyError, TypeError):
+            pass
+
+        # The model didn't follow the format, summarize one at a time instead
+        return [self._summarize_message(message) for message in messages]
+
+    def _summarize_messages(
+        self,
+        messages: list[Message],
+        min_length: int = 200,
+        batch_tokens: int = 1536,
+        idle: threading.Event | None = None,
+    ) -> list[str | None]:
+        """
+        Summarize messages, packing the long ones into batched requests.
+
+        Args:
+            messages: The messages to summarize
+            min_length: Minimum character length to trigger summarization (default: 200)
+            batch_tokens: Estimated input tokens per batched request (default: 1536).
+                         A message larger than this is summarized on its own.
+            idle: If given, waits for it to be set before each request
+
+        Returns:
+            One summary per message, in the same order. Short messages are returned
+            as-is.
+        """
+        summaries: list[str | None] = [None] * len(messages)
+        batches: list[list[int]] = []
+        batch_size = 0
+
+        for i, message in enumerate(messages):
+            # If message is short, keep it as-is without summarization
+            if len(message.content) < min_length:
+                summaries[i] = message.content
+                continue
+
+            tokens = estimate_tokens(message.content)
+            if not batches or batch_size + tokens > batch_tokens:
+                batches.append([])
+                batch_size = 0
+            batches[-1].append(i)
+            batch_size += tokens
+
+        for batch in batches:
+            if idle is not None:
+                idle.wait()
+
+            results = self._summarize_batch([messages[i] for i in batch])
+            for i, summary in zip(batch, results):
+                summaries[i] = summary
+
+        return summaries
+
+    def save_chat(
+        self,
+        chat: Chat,
+        idle: threading.Event | None = None,
+        batch_tokens: int = 1536,
+    ) -> int:
+        """
+        Save new chat messages to the vector store with embeddings.
+
+        Only processes messages after the chat's watermark, so the cost depends on the
+        number of new messages rather than the length of the chat. User and assistant
+        messages are summarized if needed and stored in ChromaDB for semantic search
+        with a single add. Messages that are already stored, e.g. because a previous
+        save was interrupted before moving the watermark, are skipped. Long messages
+        are summarized in batches.
 
         Args:
             chat: The chat object containing messages to save
+            idle: If given, waits for it to be set before each summary request, so a
+                 background save yields the model to a response being generated
+            batch_tokens: Estimated input tokens per batched summary request
+
+        Returns:
+            The number of messages added to the vector store
         """
         if chat.id is None:
-            return
+            return 0
 
         chat_id = chat.id
-        for message_index, message in enumerate(chat.messages):
-            # Only index user and assistant messages (skip log messages)
-            if message.role not in ("user", "assistant"):
-                continue
-
-            chat_message_hash = self._get_chat_message_hash(chat_id, message_index)
-            existing = self.collection.get(
-                where={"chat_message_hash": chat_message_hash}
+        watermark = self._get_watermark(chat_id)
+        last_index = len(chat.messages) - 1
+        if last_index <= watermark:
+            return 0
+
+        # Only index user and assistant messages (skip log messages)
+        new_messages = {
+            self._get_chat_message_hash(chat_id, message_index): (
+                message_index,
+                message,
+            )
+            for message_index, message in enumerate(chat.messages)
+            if message_index > watermark and message.role in ("user", "assistant")
+        }
+
+        # Check which messages have already been saved with one lookup
+        existing = set()
+        if new_messages:
+            existing = set(
+                self.collection.get(ids=list(new_messages), include=[])["ids"]
             )
 
-            # Check if message has already been saved
-            if existing and existing["ids"]:
-                return None
-
-            message_summary = self._summarize_message(message)
+        to_index = [
+            (chat_message_hash, message_index, message)
+            for chat_message_hash, (message_index, message) in new_messages.items()
+            if chat_message_hash not in existing
+        ]
+        message_summaries = self._summarize_messages(
+            [message for _, _, message in to_index],
+            batch_tokens=batch_tokens,
+            idle=idle,
+        )
 
+        ids = []
+        documents = []
+        metadatas = []
+        for (chat_message_hash, message_index, _), message_summary in zip(
+            to_index, message_summaries
+        ):
             if message_summary is None:
                 continue
 
-            metadata = {
-                "chat_id": chat_id,
-                "message_index": message_index,
-                "chat_message_hash": chat_message_hash,
-            }
-
-            self.collection.add(
-                ids=[chat_message_hash],
-                documents=[message_summary],
-                metadatas=[metadata],
+            ids.append(chat_message_hash)
+            documents.append(message_summary)
+            metadatas.append(
+                {
+                    "chat_id": chat_id,
+                    "message_index": message_index,
+                    "chat_message_hash": chat_message_hash,
+                }
             )
 
+        if ids:
+            embeddings = self.embedder.embed(documents)
+            with self.vector_store.write_lock:
+                self.collection.add(
+                    ids=ids,
+                    documents=documents,
+                    embeddings=embeddings,
+                    metadatas=metadatas,
+                )
+
+        self._set_watermark(chat_id, last_index)
+        return len(ids)
+
     def delete_chat(self, chat_id: int):
         """Delete all message summaries associated with a chat"""
         # Query for all documents with this chat_id
@@ -123,7 +324,12 @@ Provide only the summary without labels:
 
             # Delete all matching documents
             if results and results["ids"]:
-                self.collection.delete(ids=results["ids"])
+                with self.vector_store.write_lock:
+                    self.collection.delete(ids=results["ids"])
+
+            with sqlite3.connect(self.state_path) as conn:
+                conn.execute("DELETE FROM watermarks WHERE chat_id = ?", (chat_id,))
+                conn.commit()
 
         except Exception as e:
             raise Exception(f"Failed to delete chat {chat_id}: {e}")
@@ -181,7 +387,9 @@ Provide only the summary without labels:
             Exception: If the search operation fails
         """
         try:
-            results = self.collection.query(query_texts=[query], n_results=top_k)
+            results = self.collection.query(
+                query_embeddings=self.embedder.embed([query]), n_results=top_k
+            )
 
             if not results["documents"] or not results["documents"][0]:
                 return []
@@ -0,0 +1,189 @@
+import os
+import threading
+from dataclasses import dataclass
+from typing import Any, Literal, Sequence
+
+import httpx
+import ollama
+
+
+def _parse_keep_alive(value: str) -> str | float:
+    """Ollama takes keep_alive as seconds or as a duration string such as "30m" """
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+def _env_int(name: str) -> int | None:
+    value = os.environ.get(name)
+    return int(value) if value else None
+
+
+def _env_bool(name: str) -> bool | None:
+    value = os.environ.get(name)
+    if not value:
+        return None
+    return value.lower() not in ("0", "false", "no", "off")
+
+
+@dataclass
+class OllamaSettings:
+    host: str | None = None  # None uses OLLAMA_HOST or the local default
+    model: str = "llama3.2"
+    summary_model: str | None = None  # None uses the chat model
+    keep_alive: str | float = "30m"  # How long the model stays loaded after a request
+    num_ctx: int = 4096  # Context window, also the prompt token budget
+    num_thread: int | None = None  # None lets Ollama decide
+    warm_up: bool = True  # Load the models in the background on startup
+
+    @classmethod
+    def from_env(cls) -> "OllamaSettings":
+        """
+        Read settings from environment variables, falling back to the defaults.
+
+        Reads OLLAMA_HOST, OPEN_TERMINALUI_MODEL, OPEN_TERMINALUI_SUMMARY_MODEL,
+        OPEN_TERMINALUI_KEEP_ALIVE, OPEN_TERMINALUI_NUM_CTX,
+        OPEN_TERMINALUI_NUM_THREAD and OPEN_TERMINALUI_WARM_UP.
+        """
+        defaults = cls()
+        keep_alive = os.environ.get("OPEN_TERMINALUI_KEEP_ALIVE")
+        warm_up = _env_bool("OPEN_TERMINALUI_WARM_UP")
+        return cls(
+            host=os.environ.get("OLLAMA_HOST") or defaults.host,
+            model=os.environ.get("OPEN_TERMINALUI_MODEL") or defaults.model,
+            summary_model=os.environ.get("OPEN_TERMINALUI_SUMMARY_MODEL")
+            or defaults.summary_model,
+            keep_alive=_parse_keep_alive(keep_alive)
+            if keep_alive
+            else defaults.keep_alive,
+            num_ctx=_env_int("OPEN_TERMINALUI_NUM_CTX") or defaults.num_ctx,
+            num_thread=_env_int("OPEN_TERMINALUI_NUM_THREAD") or defaults.num_thread,
+            warm_up=warm_up if warm_up is not None else defaults.warm_up,
+        )
+
+    @property
+    def options(self) -> dict[str, Any]:
+        """Model options sent with every request"""
+        options: dict[str, Any] = {"num_ctx": self.num_ctx}
+        if self.num_thread is not None:
+            options["num_thread"] = self.num_thread
+        return options
+
+
+class OllamaClient:
+    """Ollama client that shares one pooled HTTP connection across all requests"""
+
+    def __init__(self, settings: OllamaSettings | None = None):
+        """
+        Initialize the client.
+
+        Args:
+            settings: Connection and model settings. If None, reads them from the
+                     environment.
+        """
+        self.settings = settings or OllamaSettings.from_env()
+        self.client = ollama.Client(
+            host=self.settings.host,
+            # Keep idle connections open between turns instead of httpx's 5 seconds
+            limits=httpx.Limits(
+                max_connections=8, max_keepalive_connections=4, keepalive_expiry=300
+            ),
+        )
+
+    @property
+    def summary_model(self) -> str:
+        """The model used for memory summaries"""
+        return self.settings.summary_model or self.settings.model
+
+    def chat(
+        self,
+        messages: list[dict],
+        stream: bool = False,
+        model: str | None = None,
+        format: Literal["", "json"] | None = None,
+    ) -> Any:
+        """
+        Send a chat request with the configured model, keep_alive and options.
+
+        Args:
+            messages: The messages in Ollama API format
+            stream: Whether to stream the response
+            model: Model to use instead of the configured chat model
+            format: Response format, e.g. "json" for structured output
+
+        Returns:
+            The ChatResponse, or an iterator of chunks if streaming
+        """
+        model = model or self.settings.model
+        # Separate calls so each matches one of Client.chat's typed overloads
+        if stream:
+            return self.client.chat(
+                model=model,
+                messages=messages,
+                stream=True,
+                format=format,
+                keep_alive=self.settings.keep_alive,
+                options=self.settings.options,
+            )
+        return self.client.chat(
+            model=model,
+            messages=messages,
+            stream=False,
+            format=format,
+            keep_alive=self.settings.keep_alive,
+            options=self.settings.options,
+        )
+
+    def summarize(
+        self, messages: list[dict], format: Literal["", "json"] | None = None
+    ) -> Any:
+        """Send a non-streaming chat request with the summary model"""
+        return self.chat(messages, model=self.summary_model, format=format)
+
+    def embed(self, texts: list[str], model: str) -> list[Sequence[float]]:
+        """
+        Embed texts with one request.
+
+        Args:
+            texts: The texts to embed
+            model: The embedding model
+
+        Returns:
+            One embedding per text, in the same order
+        """
+        response = self.client.embed(
+            model=model, input=texts, keep_alive=self.settings.keep_alive
+        )
+        return list(response.embeddings)
+
+    def warm_up(self, model: str | None = None) -> None:
+        """
+        Load a model into memory without generating anything.
+
+        Uses the same options as real requests, so Ollama doesn't reload the model
+        with a different context size on the first turn.
+
+        Args:
+            model: Model to load instead of the configured chat model
+        """
+        self.client.generate(
+            model=model or self.settings.model,
+            prompt="",
+            keep_alive=self.settings.keep_alive,
+            options=self.settings.options,
+        )
+
+
+_shared_client: OllamaClient | None = None
+_shared_client_lock = threading.Lock()
+
+
+def get_ollama_client() -> OllamaClient:
+    """Return the process-wide client, creating it from the environment on first use"""
+    global _shared_client
+
+    with _shared_client_lock:
+        if _shared_client is None:
+            _shared_client = OllamaClient()
+        return _shared_client
@@ -1,3 +1,7 @@
+import threading
+import time
+from typing import TYPE_CHECKING
+
 from textual import on, work
 from textual.app import ComposeResult
 from textual.containers import Horizontal, Vertical
@@ -10,15 +14,29 @@ from textual.widgets import (
     Static,
 )
 
-from open_terminalui.document_manager import DocumentManager
+if TYPE_CHECKING:
+    from open_terminalui.document_manager import DocumentManager, IngestProgress
+
+
+def _format_size(size: int | None) -> str:
+    """Format a size in bytes for display, e.g. 1.5 MB"""
+    if size is None:
+        return ""
+    value = float(size)
+    for unit in ("B", "KB", "MB"):
+        if value < 1024:
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GB"
 
 
 class DocumentManagerScreen(ModalScreen):
     """Modal screen for managing documents"""
 
-    def __init__(self, doc_manager: DocumentManager, *args, **kwargs):
+    def __init__(self, doc_manager: "DocumentManager", *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.doc_manager = doc_manager
+        self._cancel_ingest = threading.Event()
 
     def compose(self) -> ComposeResult:
         with Vertical(id="document_dialog"):
@@ -26,10 +44,13 @@ class DocumentManagerScreen(ModalScreen):
             yield Static(id="status_indicator")
             with Horizontal(id="document_input_container"):
                 yield Input(
-                    placeholder="Enter PDF file path...",
+                    placeholder="Enter a PDF file, directory or glob...",
                     id="document_path_input",
                 )
                 yield Button("Add", id="add_document_btn", variant="primary")
+                yield Button(
+                    "Cancel", id="cancel_ingest_btn", variant="warning", disabled=True
+                )
             yield DataTable(id="document_table")
             with Horizontal(id="document_button_container"):
                 yield Button(
@@ -41,7 +62,7 @@ class DocumentManagerScreen(ModalScreen):
         # Configure data table
         table = self.query_one("#document_table", DataTable)
         table.cursor_type = "row"
-        table.add_columns("Name", "Path", "Chunks")
+        table.add_columns("Name", "Path", "Chunks", "Size", "Added")
 
         # Load table rows
         self._refresh_table()
@@ -58,7 +79,16 @@ class DocumentManagerScreen(ModalScreen):
 
         # Populate table
         for document in documents:
-            table.add_row(document[1], document[0], document[2], key=str(document[0]))
+            table.add_row(
+                document.file_name,
+                document.file_path,
+                document.chunk_count,
+                _format_size(document.size),
+                document.ingested_at.strftime("%Y-%m-%d %H:%M")
+                if document.ingested_at is not None
+                else "",
+                key=document.file_path,
+            )
 
     @on(Button.Pressed, "#add_document_btn")
     def handle_add_document(self) -> None:
@@ -71,32 +101,70 @@ class DocumentManagerScreen(ModalScreen):
         # Clear input widget
         input_widget.clear()
 
-        # Process document
-        self.process_document(file_path)
+        # Process documents
+        self._cancel_ingest = threading.Event()
+        self.process_documents(file_path, self._cancel_ingest)
 
     @work(exclusive=True, thread=True)
-    def process_document(self, file_path: str) -> None:
+    def process_documents(self, pattern: str, cancel: threading.Event) -> None:
         # Select widgets
         status_widget = self.query_one("#status_indicator", Static)
         input_widget = self.query_one("#document_path_input", Input)
         button_widget = self.query_one("#add_document_btn", Button)
+        cancel_widget = self.query_one("#cancel_ingest_btn", Button)
 
         # Disable button and show processing status
         self.app.call_from_thread(setattr, button_widget, "disabled", True)
+        self.app.call_from_thread(setattr, cancel_widget, "disabled", False)
         self.app.call_from_thread(status_widget.update, "Processing...")
 
-        # Process document
-        success, message = self.doc_manager.add_document(file_path)
+        last_refresh = time.monotonic()
+
+        def show_progress(report: "IngestProgress") -> None:
+            nonlocal last_refresh
+            self.app.call_from_thread(status_widget.update, report.status())
+
+            # Show added documents as they come, without redrawing the table per file
+            if report.added and time.monotonic() - last_refresh >= 1.0:
+                last_refresh = time.monotonic()
+                self.app.call_from_thread(self._refresh_table)
+
+        # Imported here, the document manager's dependencies load on first use
+        from open_terminalui.document_manager import find_documents
+
+        # Process documents
+        file_paths = find_documents(pattern)
+        report = self.doc_manager.add_documents(
+            file_paths, progress=show_progress, cancel=cancel
+        )
 
         # Update status and re-enable button
+        if not file_paths:
+            message = f"No PDF files found: {pattern}"
+        elif report.total == 1:
+            message = report.message
+        else:
+            message = report.summary()
         self.app.call_from_thread(status_widget.update, message)
         self.app.call_from_thread(setattr, button_widget, "disabled", False)
+        self.app.call_from_thread(setattr, cancel_widget, "disabled", True)
 
-        # If successful, clear input widget and update table
-        if success:
+        # If any were added, clear input widget and update table
+        if report.added:
             self.app.call_from_thread(input_widget.clear)
             self.app.call_from_thread(self._refresh_table)
 
+    @on(Button.Pressed, "#cancel_ingest_btn")
+    def handle_cancel_ingest(self) -> None:
+        # Documents being added are dropped, the rest aren't started
+        self._cancel_ingest.set()
+        self.query_one("#status_indicator", Static).update("Cancelling...")
+        self.query_one("#cancel_ingest_btn", Button).disabled = True
+
+    def on_unmount(self) -> None:
+        # Stop adding documents when the screen is closed
+        self._cancel_ingest.set()
+
     @on(Button.Pressed, "#remove_document_btn")
     def handle_remove_document(self) -> None:
         # Select widgets
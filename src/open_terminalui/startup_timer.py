@@ -0,0 +1,63 @@
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+
+
+class StartupTimer:
+    """Records how long each startup phase took, to track cold-start regressions"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.marks: dict[str, float] = {}
+
+    def mark(self, name: str) -> float:
+        """
+        Record that a startup phase finished. Only the first mark per name is kept.
+
+        Args:
+            name: The phase name, e.g. "first_paint"
+
+        Returns:
+            Seconds since the timer was created
+        """
+        elapsed = time.perf_counter() - self.started
+        self.marks.setdefault(name, elapsed)
+        return self.marks[name]
+
+    def report(self) -> str:
+        """Format the recorded phases as a single line"""
+        return ", ".join(
+            f"{name} {elapsed:.3f}s" for name, elapsed in self.marks.items()
+        )
+
+    def save(self, path: str | None = None) -> None:
+        """
+        Append the recorded phases to a JSON lines file.
+
+        Args:
+            path: Path of the report file. If None, defaults to
+                 ~/.open-terminalui/startup.jsonl
+        """
+        if path is None:
+            app_dir = Path.home() / ".open-terminalui"
+            app_dir.mkdir(exist_ok=True)
+            path = str(app_dir / "startup.jsonl")
+
+        record = {"timestamp": datetime.now().isoformat(), "marks": self.marks}
+        with open(path, "a") as f:
+            f.write(json.dumps(record) + "\n")
+
+
+def startup_report_path() -> str | None:
+    """
+    Where to save the startup report, from OPEN_TERMINALUI_STARTUP_REPORT.
+
+    Returns:
+        None if reporting is disabled, "" to use the default path, otherwise the path
+    """
+    value = os.environ.get("OPEN_TERMINALUI_STARTUP_REPORT")
+    if not value or value == "0":
+        return None
+    return "" if value == "1" else value
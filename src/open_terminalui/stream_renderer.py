@@ -0,0 +1,58 @@
+import time
+
+from open_terminalui.components import ChatMessage
+
+
+class StreamRenderer:
+    """Coalesces streamed tokens and flushes them to a ChatMessage at a fixed rate"""
+
+    def __init__(self, message: ChatMessage, flush_interval: float = 1 / 30):
+        """
+        Initialize the stream renderer.
+
+        Args:
+            message: The mounted ChatMessage widget that receives the streamed text
+            flush_interval: Minimum number of seconds between two flushes to the UI
+                           (default: 1/30, i.e. at most 30 redraws per second)
+        """
+        self.message = message
+        self.flush_interval = flush_interval
+        self._pending: list[str] = []
+        self._parts: list[str] = []
+        self._last_flush = 0.0
+
+    @property
+    def text(self) -> str:
+        """All text written so far, including text that hasn't been flushed yet"""
+        return "".join(self._parts + self._pending)
+
+    def write(self, chunk: str) -> None:
+        """
+        Buffer a streamed chunk, flushing if the flush interval has elapsed.
+
+        Safe to call from a worker thread; flushing never waits on the event loop.
+
+        Args:
+            chunk: The text delta received from the model
+        """
+        if not chunk:
+            return
+
+        self._pending.append(chunk)
+
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """Post all buffered text to the message widget as a single append"""
+        self._last_flush = time.monotonic()
+
+        if not self._pending:
+            return
+
+        text = "".join(self._pending)
+        self._pending.clear()
+        self._parts.append(text)
+
+        # post_message is thread-safe and returns immediately
+        self.message.post_message(ChatMessage.Append(text))
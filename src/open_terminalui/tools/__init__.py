@@ -1,5 +1,17 @@
-from .document_search import document_search
-from .memory_search import memory_search
-from .web_search import web_search
+from .document_search import document_search, document_search_blocks
+from .memory_search import memory_search, memory_search_blocks
+from .retrieval import ContextBlock, RetrievalResult, Retriever, run_retrievers
+from .web_search import web_search, web_search_blocks
 
-__all__ = ["web_search", "document_search", "memory_search"]
+__all__ = [
+    "web_search",
+    "web_search_blocks",
+    "document_search",
+    "document_search_blocks",
+    "memory_search",
+    "memory_search_blocks",
+    "ContextBlock",
+    "Retriever",
+    "RetrievalResult",
+    "run_retrievers",
+]
@@ -1,21 +1,38 @@
-from open_terminalui.document_manager import DocumentManager
+from typing import TYPE_CHECKING
+
+from .retrieval import ContextBlock
+
+if TYPE_CHECKING:
+    from open_terminalui.document_manager import DocumentManager
+
+
+def document_search_blocks(
+    doc_manager: "DocumentManager", query: str, max_results: int = 5
+) -> list[ContextBlock]:
+    """Perform document search and return one context block per chunk"""
+    # Search vector database
+    results = doc_manager.search_documents(query=query, top_k=max_results)
+
+    blocks = []
+    for result in results:
+        text = f"File Path: {result[1]}\n"
+        text += f"Content: {result[0]}\n"
+        text += f"Relevance Score: {result[2]:.4f}\n\n"
+        blocks.append(ContextBlock(text=text, score=result[2]))
+
+    return blocks
 
 
 def document_search(
-    doc_manager: DocumentManager, query: str, max_results: int = 5
+    doc_manager: "DocumentManager", query: str, max_results: int = 5
 ) -> str:
     """Perform document search and return formatted results"""
     try:
-        # Search vector database
-        results = doc_manager.search_documents(query=query, top_k=max_results)
+        blocks = document_search_blocks(
+            doc_manager=doc_manager, query=query, max_results=max_results
+        )
 
         # Format results for LLM context
-        formatted_results = ""
-        for result in results:
-            formatted_results += f"File Path: {result[1]}\n"
-            formatted_results += f"Content: {result[0]}\n"
-            formatted_results += f"Similarity Score: {result[2]}\n\n"
-
-        return formatted_results
+        return "".join(block.text for block in blocks)
     except Exception as e:
         return f"Vector search error: {str(e)}"
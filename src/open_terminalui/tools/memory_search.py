@@ -1,20 +1,37 @@
-from open_terminalui.memory_manager import MemoryManager
+from typing import TYPE_CHECKING
+
+from .retrieval import ContextBlock
+
+if TYPE_CHECKING:
+    from open_terminalui.memory_manager import MemoryManager
+
+
+def memory_search_blocks(
+    memory_manager: "MemoryManager", query: str, max_results: int = 5
+) -> list[ContextBlock]:
+    """Perform memory search and return one context block per summary"""
+    # Search vector database
+    results = memory_manager.search_chat_summaries(query=query, top_k=max_results)
+
+    blocks = []
+    for result in results:
+        text = f"Content: {result[0]}\n"
+        text += f"Similarity Score: {result[1]}\n\n"
+        blocks.append(ContextBlock(text=text, score=result[1]))
+
+    return blocks
 
 
 def memory_search(
-    memory_manager: MemoryManager, query: str, max_results: int = 5
+    memory_manager: "MemoryManager", query: str, max_results: int = 5
 ) -> str:
     """Perform document search and return formatted results"""
     try:
-        # Search vector database
-        results = memory_manager.search_chat_summaries(query=query, top_k=max_results)
+        blocks = memory_search_blocks(
+            memory_manager=memory_manager, query=query, max_results=max_results
+        )
 
         # Format results for LLM context
-        formatted_results = ""
-        for result in results:
-            formatted_results += f"Content: {result[0]}\n"
-            formatted_results += f"Similarity Score: {result[1]}\n\n"
-
-        return formatted_results
+        return "".join(block.text for block in blocks)
     except Exception as e:
         return f"Vector search error: {str(e)}"
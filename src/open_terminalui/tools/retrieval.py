@@ -0,0 +1,101 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable
+
+
+@dataclass
+class ContextBlock:
+    text: str  # Formatted for the LLM context
+    score: float  # Higher is more relevant
+
+
+@dataclass
+class Retriever:
+    role: str  # Log message role, e.g. "web_search"
+    label: str  # Shown in the loading indicator, e.g. "the web"
+    context_prompt: str  # Prepended to the results in the system message
+    search: Callable[[], list[ContextBlock]]
+    timeout: float = 10.0
+
+
+@dataclass
+class RetrievalResult:
+    role: str
+    context_prompt: str
+    blocks: list[ContextBlock]
+    error: str | None = None
+
+    @property
+    def content(self) -> str:
+        """The formatted results, or the error if the retriever failed"""
+        if self.error is not None:
+            return self.error
+        if not self.blocks:
+            return "No search results found."
+        return "".join(block.text for block in self.blocks)
+
+    def to_system_message(self, blocks: list[ContextBlock] | None = None) -> dict:
+        """
+        Wrap the results in a system message for the Ollama API.
+
+        Args:
+            blocks: Subset of the blocks to include. If None, includes all of them.
+        """
+        if blocks is not None:
+            content = "".join(block.text for block in blocks)
+        else:
+            content = self.content
+        return {"role": "system", "content": f"{self.context_prompt}\n\n{content}"}
+
+
+def run_retrievers(retrievers: list[Retriever]) -> list[RetrievalResult]:
+    """
+    Run retrievers concurrently and collect their results.
+
+    Each retriever gets its own timeout measured from when all of them were started,
+    so one slow retriever only delays the turn by its own timeout. A retriever that
+    times out or raises produces a result with an error and no blocks.
+
+    Args:
+        retrievers: The retrievers to run
+
+    Returns:
+        List of results in the same order as the given retrievers
+    """
+    if not retrievers:
+        return []
+
+    executor = ThreadPoolExecutor(
+        max_workers=len(retrievers), thread_name_prefix="retriever"
+    )
+
+    try:
+        started = time.monotonic()
+        futures = [executor.submit(retriever.search) for retriever in retrievers]
+
+        results = []
+        for retriever, future in zip(retrievers, futures):
+            remaining = max(0.0, started + retriever.timeout - time.monotonic())
+            blocks: list[ContextBlock] = []
+            error = None
+            try:
+                blocks = future.result(timeout=remaining)
+            except TimeoutError:
+                error = f"Search timed out after {retriever.timeout:g} seconds"
+            except Exception as e:
+                error = f"Search error: {str(e)}"
+
+            results.append(
+                RetrievalResult(
+                    role=retriever.role,
+                    context_prompt=retriever.context_prompt,
+                    blocks=blocks,
+                    error=error,
+                )
+            )
+
+        return results
+    finally:
+        # Don't wait for retrievers that timed out, their results are discarded
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -1,20 +1,35 @@
-from ddgs import DDGS
+from .retrieval import ContextBlock
+
+
+def web_search_blocks(query: str, max_results: int = 5) -> list[ContextBlock]:
+    """
+    Perform web search and return one context block per result.
+
+    Results have no relevance score, so blocks are scored by their rank.
+    """
+    # Imported here since ddgs is slow to import and search is off by default
+    from ddgs import DDGS
+
+    results = list(DDGS().text(query, max_results=max_results))
+
+    blocks = []
+    for rank, result in enumerate(results):
+        text = f"Title: {result['title']}\n"
+        text += f"Content: {result['body']}\n"
+        text += f"Source: {result['href']}\n\n"
+        blocks.append(ContextBlock(text=text, score=1 / (rank + 1)))
+
+    return blocks
 
 
 def web_search(query: str, max_results: int = 5) -> str:
     """Perform web search and return formatted results"""
     try:
-        results = list(DDGS().text(query, max_results=max_results))
-        if not results:
+        blocks = web_search_blocks(query=query, max_results=max_results)
+        if not blocks:
             return "No search results found."
 
         # Format results for LLM context
-        formatted_results = ""
-        for result in results:
-            formatted_results += f"Title: {result['title']}\n"
-            formatted_results += f"Content: {result['body']}\n"
-            formatted_results += f"Source: {result['href']}\n\n"
-
-        return formatted_results
+        return "".join(block.text for block in blocks)
     except Exception as e:
         return f"Search error: {str(e)}"
@@ -0,0 +1,93 @@
+import threading
+from pathlib import Path
+from typing import Any
+
+import chromadb
+from chromadb.api.models.Collection import Collection
+
+from open_terminalui.embeddings import Embedder, EmbeddingCache
+
+
+class VectorStore:
+    """A single ChromaDB client and its collections, shared across managers"""
+
+    def __init__(
+        self, storage_path: str | None = None, embedder: Embedder | None = None
+    ):
+        """
+        Open the ChromaDB store.
+
+        Args:
+            storage_path: Path to the ChromaDB directory. If None, defaults to
+                         ~/.open-terminalui/chroma_db
+            embedder: Computes the embeddings stored in the collections. If None,
+                     uses the backend configured in the environment, cached in
+                     embeddings.db next to the ChromaDB directory.
+        """
+        self.storage_path = resolve_storage_path(storage_path)
+        self.client = chromadb.PersistentClient(path=self.storage_path)
+        self._collections: dict[str, Collection] = {}
+
+        if embedder is None:
+            cache_path = str(Path(self.storage_path).parent / "embeddings.db")
+            embedder = Embedder.from_settings(cache=EmbeddingCache(cache_path))
+        self.embedder = embedder
+
+        # Serializes collection creation and writes from the UI and worker threads.
+        # Queries don't take it, so concurrent retrievers never wait on each other.
+        self.write_lock = threading.RLock()
+
+    def get_collection(
+        self, name: str, metadata: dict[str, Any] | None = None
+    ) -> Collection:
+        """
+        Get or create a collection, reusing the same handle for every caller.
+
+        Args:
+            name: The collection name, suffixed with the embedding model unless it's
+                 the default one
+            metadata: Metadata to set if the collection is created
+
+        Returns:
+            The collection
+        """
+        with self.write_lock:
+            if name not in self._collections:
+                self._collections[name] = self.client.get_or_create_collection(
+                    name=self.embedder.collection_name(name), metadata=metadata
+                )
+            return self._collections[name]
+
+
+def resolve_storage_path(storage_path: str | None = None) -> str:
+    """Return the given path, or ~/.open-terminalui/chroma_db if None"""
+    if storage_path is None:
+        # Default to ~/.open-terminalui/chroma_db
+        app_dir = Path.home() / ".open-terminalui"
+        app_dir.mkdir(exist_ok=True)
+        storage_path = str(app_dir / "chroma_db")
+
+    return storage_path
+
+
+_stores: dict[str, VectorStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_vector_store(storage_path: str | None = None) -> VectorStore:
+    """
+    Return the shared store for a path, opening it on first use.
+
+    Args:
+        storage_path: Path to the ChromaDB directory. If None, defaults to
+                     ~/.open-terminalui/chroma_db
+
+    Returns:
+        The one VectorStore for that path in this process
+    """
+    storage_path = str(Path(resolve_storage_path(storage_path)).resolve())
+
+    with _stores_lock:
+        if storage_path not in _stores:
+            _stores[storage_path] = VectorStore(storage_path)
+        return _stores[storage_path]
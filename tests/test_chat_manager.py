@@ -0,0 +1,206 @@
+import json
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+from open_terminalui._models import Chat, Message
+from open_terminalui.chat_manager import SCHEMA_VERSION, ChatManager
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "chats.db")
+
+
+@pytest.fixture
+def chat_manager(db_path):
+    chat_manager = ChatManager(db_path)
+    yield chat_manager
+    chat_manager.close()
+
+
+def make_chat(title: str, turns: int) -> Chat:
+    chat = Chat.create_unsaved(title)
+    for i in range(turns):
+        chat.messages.append(Message(role="user", content=f"question {i}"))
+        chat.messages.append(Message(role="assistant", content=f"answer {i}"))
+    return chat
+
+
+def create_legacy_db(db_path: str) -> None:
+    """A database written before messages had their own table"""
+    conn = sqlite3.connect(db_path)
+    conn.execute("""
+        CREATE TABLE chats (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            messages_json TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        )
+    """)
+    messages = [
+        {"role": "user", "content": "What is a zebra crossing?"},
+        {"role": "assistant", "content": "A striped pedestrian crossing."},
+        {"role": "web_search", "content": "zebra results"},
+    ]
+    conn.executemany(
+        "INSERT INTO chats (id, title, messages_json, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+        [
+            (
+                3,
+                "Zebras",
+                json.dumps(messages),
+                "2025-01-01T10:00:00",
+                "2025-01-02T10:00:00",
+            ),
+            (7, "Empty", json.dumps([]), "2025-01-03T10:00:00", "2025-01-03T10:00:00"),
+        ],
+    )
+    conn.commit()
+    conn.close()
+
+
+def test_legacy_database_is_migrated(db_path):
+    create_legacy_db(db_path)
+
+    chat_manager = ChatManager(db_path)
+    chat = chat_manager.load_chat(3)
+    empty = chat_manager.load_chat(7)
+    results = chat_manager.search_chats("zebra")
+    chat_manager.close()
+
+    assert chat is not None
+    assert chat.title == "Zebras"
+    assert chat.updated_at == datetime(2025, 1, 2, 10)
+    assert [(msg.role, msg.content, msg.seq) for msg in chat.messages] == [
+        ("user", "What is a zebra crossing?", 0),
+        ("assistant", "A striped pedestrian crossing.", 1),
+        ("web_search", "zebra results", 2),
+    ]
+    assert empty is not None and empty.messages == []
+    # Migrated messages are full-text indexed
+    assert [summary.id for summary in results] == [3]
+
+    conn = sqlite3.connect(db_path)
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(chats)")]
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    conn.close()
+    assert "messages_json" not in columns
+    assert version == SCHEMA_VERSION
+
+
+def test_reopening_a_migrated_database_keeps_it(db_path):
+    create_legacy_db(db_path)
+    ChatManager(db_path).close()
+
+    chat_manager = ChatManager(db_path)
+    chat = chat_manager.load_chat(3)
+    chat_manager.close()
+
+    assert chat is not None
+    assert len(chat.messages) == 3
+
+
+def test_save_appends_only_new_messages(chat_manager):
+    chat = make_chat("Chat", turns=2)
+    chat_manager.save_chat(chat)
+    assert chat.id is not None
+    assert [msg.seq for msg in chat.messages] == [0, 1, 2, 3]
+
+    chat.title = "Renamed"
+    chat.messages.append(Message(role="user", content="follow-up"))
+    chat_manager.save_chat(chat)
+
+    loaded = chat_manager.load_chat(chat.id)
+    assert loaded is not None
+    assert loaded.title == "Renamed"
+    assert [msg.content for msg in loaded.messages] == [
+        msg.content for msg in chat.messages
+    ]
+    assert chat.messages[-1].seq == 4
+
+
+def test_messages_are_loaded_a_page_at_a_time(chat_manager):
+    chat = make_chat("Chat", turns=5)
+    chat_manager.save_chat(chat)
+    assert chat.id is not None
+
+    loaded = chat_manager.load_chat(chat.id, limit=4)
+    assert loaded is not None
+    assert [msg.seq for msg in loaded.messages] == [6, 7, 8, 9]
+
+    older = chat_manager.load_messages(chat.id, before_seq=6, limit=4)
+    assert [msg.seq for msg in older] == [2, 3, 4, 5]
+    assert [msg.seq for msg in chat_manager.load_messages(chat.id, before_seq=2)] == [
+        0,
+        1,
+    ]
+
+
+def test_summaries_are_paged_most_recent_first(chat_manager):
+    chats = [make_chat(f"Chat {i}", turns=1) for i in range(5)]
+    for chat in chats:
+        chat_manager.save_chat(chat)
+
+    first = chat_manager.list_chat_summaries(limit=2)
+    second = chat_manager.list_chat_summaries(limit=2, after=first[-1])
+    rest = chat_manager.list_chat_summaries(after=second[-1])
+
+    assert [summary.title for summary in first + second + rest] == [
+        "Chat 4",
+        "Chat 3",
+        "Chat 2",
+        "Chat 1",
+        "Chat 0",
+    ]
+
+
+def test_summaries_with_the_same_timestamp_are_all_listed(chat_manager):
+    now = datetime.now()
+
+    def insert(conn: sqlite3.Connection) -> None:
+        conn.executemany(
+            "INSERT INTO chats (title, created_at, updated_at) VALUES (?, ?, ?)",
+            [(f"Chat {i}", now.isoformat(), now.isoformat()) for i in range(3)],
+        )
+
+    chat_manager.db.execute_write(insert)
+
+    first = chat_manager.list_chat_summaries(limit=2)
+    rest = chat_manager.list_chat_summaries(after=first[-1])
+
+    assert len({summary.id for summary in first + rest}) == 3
+
+
+def test_search_matches_all_words_and_prefixes(chat_manager):
+    chat = Chat.create_unsaved("Trains")
+    chat.messages = [
+        Message(role="user", content="When does the night-train to Vienna leave?"),
+        Message(role="web_search", content="timetable for Budapest"),
+    ]
+    chat_manager.save_chat(chat)
+    chat_manager.save_chat(make_chat("Other", turns=1))
+
+    assert [summary.id for summary in chat_manager.search_chats("vienna nig")] == [
+        chat.id
+    ]
+    assert chat_manager.search_chats("train Budapest") == []
+    # FTS5 syntax in the query is searched for literally, not parsed
+    assert [summary.id for summary in chat_manager.search_chats("night-train")] == [
+        chat.id
+    ]
+    assert chat_manager.search_chats("vienna OR zebra") == []
+    assert chat_manager.search_chats("   ") == []
+
+
+def test_deleted_chats_are_gone_from_search(chat_manager):
+    chat = make_chat("Chat", turns=1)
+    chat_manager.save_chat(chat)
+    assert chat.id is not None
+
+    chat_manager.delete_chat(chat.id)
+
+    assert chat_manager.load_chat(chat.id) is None
+    assert chat_manager.search_chats("question") == []
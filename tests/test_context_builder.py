@@ -0,0 +1,217 @@
+import pytest
+
+from open_terminalui.context_builder import (
+    ContextBuilder,
+    assemble_messages,
+    estimate_tokens,
+    message_tokens,
+    prompt_layout_from_env,
+)
+from open_terminalui.tools.retrieval import ContextBlock, RetrievalResult
+
+
+def make_history(turns: int, words: int = 20) -> list[dict]:
+    history = []
+    for i in range(turns):
+        history.append({"role": "user", "content": f"question {i} " * words})
+        history.append({"role": "assistant", "content": f"answer {i} " * words})
+    return history
+
+
+def make_result(role: str, scores: list[float], words: int = 10) -> RetrievalResult:
+    return RetrievalResult(
+        role=role,
+        context_prompt=f"Results from {role}:",
+        blocks=[ContextBlock(f"{role} {score} " * words, score) for score in scores],
+    )
+
+
+def total_tokens(messages: list[dict]) -> int:
+    return sum(message_tokens(message) for message in messages)
+
+
+def test_estimate_tokens_rounds_up():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abc") == 1
+    assert estimate_tokens("abcde") == 2
+
+
+def test_stable_prefix_puts_context_before_latest_user_message():
+    history = make_history(2) + [{"role": "user", "content": "latest"}]
+    context = [{"role": "system", "content": "results"}]
+
+    messages = assemble_messages(history, context, layout="stable_prefix")
+
+    assert messages == history[:-1] + context + history[-1:]
+
+
+def test_prepend_puts_context_before_history():
+    history = make_history(1)
+    context = [{"role": "system", "content": "results"}]
+
+    assert assemble_messages(history, context, layout="prepend") == context + history
+
+
+def test_unknown_layout_is_rejected():
+    with pytest.raises(ValueError):
+        assemble_messages([], [], layout="sideways")
+    with pytest.raises(ValueError):
+        ContextBuilder(layout="sideways")
+
+
+def test_prompt_layout_from_env(monkeypatch):
+    monkeypatch.delenv("OPEN_TERMINALUI_PROMPT_LAYOUT", raising=False)
+    assert prompt_layout_from_env() == "stable_prefix"
+
+    monkeypatch.setenv("OPEN_TERMINALUI_PROMPT_LAYOUT", "prepend")
+    assert prompt_layout_from_env() == "prepend"
+
+    monkeypatch.setenv("OPEN_TERMINALUI_PROMPT_LAYOUT", "sideways")
+    with pytest.raises(ValueError):
+        prompt_layout_from_env()
+
+
+def test_history_within_budget_is_sent_unchanged():
+    builder = ContextBuilder(max_tokens=4096)
+    history = make_history(3) + [{"role": "user", "content": "latest"}]
+
+    messages, usage = builder.build(history, [])
+
+    assert messages == history
+    assert usage.dropped_messages == 0
+    assert usage.history == total_tokens(history)
+
+
+def test_history_is_compacted_to_fit_the_budget():
+    builder = ContextBuilder(max_tokens=600, reserve_tokens=100)
+    history = make_history(20) + [{"role": "user", "content": "latest"}]
+
+    messages, usage = builder.build(history, [])
+
+    assert total_tokens(messages) <= builder.budget
+    assert usage.total <= usage.budget
+    assert usage.dropped_messages > 0
+    # The latest message is kept and the history starts on a user turn
+    assert messages[-1] == history[-1]
+    assert messages[0]["role"] == "user"
+    assert messages == history[usage.dropped_messages :]
+
+
+def test_compaction_keeps_the_prefix_stable_for_the_next_turns():
+    builder = ContextBuilder(max_tokens=600, reserve_tokens=100)
+    history = make_history(20) + [{"role": "user", "content": "latest"}]
+    first, _ = builder.build(history, [])
+
+    history += [
+        {"role": "assistant", "content": "short answer"},
+        {"role": "user", "content": "follow-up"},
+    ]
+    second, usage = builder.build(history, [])
+
+    # Compacting below the budget leaves room, so nothing more is dropped
+    assert second[: len(first)] == first
+    assert usage.total <= usage.budget
+
+
+def test_latest_message_is_kept_even_if_it_exceeds_the_budget():
+    builder = ContextBuilder(max_tokens=200, reserve_tokens=100)
+    history = make_history(2) + [{"role": "user", "content": "word " * 1000}]
+
+    messages, _ = builder.build(history, [])
+
+    assert messages == history[-1:]
+
+
+def test_retrieval_blocks_are_admitted_by_score_within_their_share():
+    builder = ContextBuilder(max_tokens=1124, reserve_tokens=100, retrieval_share=0.25)
+    results = [
+        make_result("web_search", [0.1, 0.9, 0.5, 0.3]),
+        make_result("document_search", [0.8, 0.2, 0.7]),
+    ]
+
+    messages, usage = builder.build([{"role": "user", "content": "hi"}], results)
+
+    context = [message for message in messages if message["role"] == "system"]
+    assert usage.retrieval <= int(builder.budget * builder.retrieval_share)
+    assert usage.dropped_blocks > 0
+    # Each retriever's best block made it in, in the retriever's own order
+    assert "web_search 0.9" in context[0]["content"]
+    assert "web_search 0.1" not in context[0]["content"]
+    assert "document_search 0.8" in context[1]["content"]
+    assert context[0]["content"].index("0.9") < context[0]["content"].index("0.5")
+
+
+def test_retrieval_that_doesnt_fit_is_dropped():
+    builder = ContextBuilder(max_tokens=200, reserve_tokens=100)
+    results = [make_result("web_search", [1.0], words=500)]
+
+    messages, usage = builder.build([{"role": "user", "content": "hi"}], results)
+
+    assert messages == [{"role": "user", "content": "hi"}]
+    assert usage.retrieval == 0
+    assert usage.dropped_blocks == 1
+
+
+def test_dropped_turns_are_summarized():
+    summarized: list[list[dict]] = []
+
+    def summarizer(messages: list[dict]) -> str:
+        summarized.append(messages)
+        return f"summary {len(summarized)}"
+
+    builder = ContextBuilder(max_tokens=600, reserve_tokens=100, summarizer=summarizer)
+    history = make_history(20) + [{"role": "user", "content": "latest"}]
+
+    messages, usage = builder.build(history, [])
+
+    assert len(summarized) == 1
+    # Only the latest dropped messages that fit in the budget are summarized
+    assert total_tokens(summarized[0]) <= builder.budget
+    assert summarized[0][-1] == history[usage.dropped_messages - 1]
+    assert messages[0] == {
+        "role": "system",
+        "content": "Summary of the earlier conversation:\n\nsummary 1",
+    }
+    assert usage.summary == message_tokens(messages[0])
+    assert usage.total <= usage.budget
+
+    # The next compaction summarizes the previous summary with the new turns
+    history += make_history(10)
+    builder.build(history, [])
+    assert summarized[1][0] == messages[0]
+
+
+def test_failed_summary_keeps_the_previous_one():
+    fail = False
+
+    def summarizer(messages: list[dict]) -> str:
+        if fail:
+            raise ConnectionError("Ollama is not running")
+        return "first summary"
+
+    builder = ContextBuilder(max_tokens=600, reserve_tokens=100, summarizer=summarizer)
+    history = make_history(20)
+    builder.build(history, [])
+
+    fail = True
+    history += make_history(10)
+    messages, usage = builder.build(history, [])
+
+    assert usage.summary_failed
+    assert "first summary" in messages[0]["content"]
+    assert usage.total <= usage.budget
+
+
+def test_reset_forgets_compaction():
+    builder = ContextBuilder(
+        max_tokens=600, reserve_tokens=100, summarizer=lambda messages: "summary"
+    )
+    builder.build(make_history(20), [])
+
+    builder.reset()
+    history = make_history(1)
+    messages, usage = builder.build(history, [])
+
+    assert messages == history
+    assert usage.dropped_messages == 0
+    assert usage.summary == 0
@@ -0,0 +1,121 @@
+import sqlite3
+import threading
+
+import pytest
+
+from open_terminalui.database import Database
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = Database(str(tmp_path / "test.db"))
+    db.execute_write(
+        lambda conn: conn.execute(
+            "CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT UNIQUE)"
+        )
+    )
+    yield db
+    db.close()
+
+
+def insert(name: str):
+    def job(conn: sqlite3.Connection) -> int | None:
+        return conn.execute("INSERT INTO items (name) VALUES (?)", (name,)).lastrowid
+
+    return job
+
+
+def names(db: Database) -> list[str]:
+    with db.read() as conn:
+        return [
+            row["name"] for row in conn.execute("SELECT name FROM items ORDER BY id")
+        ]
+
+
+def test_write_returns_the_jobs_result(db):
+    assert db.execute_write(insert("a")) == 1
+    assert names(db) == ["a"]
+
+
+def test_queued_writes_run_in_order(db):
+    # Hold the writer in a job so the next writes queue up behind it
+    started = threading.Event()
+    release = threading.Event()
+
+    def block(conn: sqlite3.Connection) -> None:
+        started.set()
+        release.wait()
+
+    blocking = db.write(block)
+    started.wait()
+    futures = [db.write(insert(name)) for name in "abc"]
+    release.set()
+
+    assert [future.result() for future in futures] == [1, 2, 3]
+    blocking.result()
+    assert names(db) == ["a", "b", "c"]
+
+
+def test_failed_job_is_rolled_back_alone(db):
+    started = threading.Event()
+    release = threading.Event()
+
+    def block(conn: sqlite3.Connection) -> None:
+        started.set()
+        release.wait()
+
+    def fail(conn: sqlite3.Connection) -> None:
+        conn.execute("INSERT INTO items (name) VALUES ('partial')")
+        raise ValueError("job failed")
+
+    db.write(block)
+    started.wait()
+    # In the same batch: the failing job sits between two that succeed
+    first = db.write(insert("a"))
+    failed = db.write(fail)
+    duplicate = db.write(insert("a"))
+    last = db.write(insert("b"))
+    release.set()
+
+    first.result()
+    last.result()
+    with pytest.raises(ValueError):
+        failed.result()
+    with pytest.raises(sqlite3.IntegrityError):
+        duplicate.result()
+    assert names(db) == ["a", "b"]
+
+
+def test_read_sees_one_snapshot(db):
+    db.execute_write(insert("a"))
+
+    with db.read() as conn:
+        before = conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+        db.execute_write(insert("b"))
+        during = conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+
+    assert before == during == 1
+    assert names(db) == ["a", "b"]
+
+
+def test_nested_reads_share_the_transaction(db):
+    with db.read() as outer:
+        with db.read() as inner:
+            assert inner is outer
+        assert outer.in_transaction
+    assert not outer.in_transaction
+
+
+def test_close_commits_queued_writes(tmp_path):
+    path = str(tmp_path / "test.db")
+    db = Database(path)
+    db.write(lambda conn: conn.execute("CREATE TABLE items (name TEXT)"))
+    db.write(lambda conn: conn.execute("INSERT INTO items VALUES ('a')"))
+    db.close()
+
+    conn = sqlite3.connect(path)
+    assert conn.execute("SELECT name FROM items").fetchall() == [("a",)]
+    conn.close()
+
+    with pytest.raises(RuntimeError):
+        db.write(insert("b"))
@@ -0,0 +1,82 @@
+import sqlite3
+
+import pytest
+
+from open_terminalui.document_index import DocumentIndex
+from open_terminalui.document_manager import reciprocal_rank_fusion
+
+
+@pytest.fixture
+def index_path(tmp_path):
+    return str(tmp_path / "documents.db")
+
+
+@pytest.fixture
+def index(index_path):
+    index = DocumentIndex(index_path)
+    yield index
+    index.db.close()
+
+
+def add_document(index: DocumentIndex, file_path: str, file_hash: str, chunks):
+    index.add_chunks(chunks)
+    return index.set_document(
+        file_path, file_path, file_hash, [chunk_id for chunk_id, _ in chunks]
+    )
+
+
+def test_search_ranks_exact_terms(index):
+    add_document(
+        index,
+        "manual.pdf",
+        "h1",
+        [
+            ("a", "The pump reports error E-4012 when the filter is clogged."),
+            ("b", "Clean the filter every month to keep the pump running."),
+            ("c", "Warranty terms and conditions."),
+        ],
+    )
+
+    results = index.search("E-4012 filter")
+
+    assert [chunk_id for chunk_id, _ in results] == ["a", "b"]
+    assert index.search("") == []
+    # FTS5 syntax is searched for literally
+    assert index.search('"unbalanced') == []
+
+
+def test_search_survives_vacuum(index_path):
+    index = DocumentIndex(index_path)
+    add_document(
+        index, "a.pdf", "h1", [(f"a{i}", f"first document part {i}") for i in range(5)]
+    )
+    add_document(index, "b.pdf", "h2", [("b0", "second document zebra")])
+    # Removing the first document leaves gaps in the rowids
+    index.remove_document("a.pdf")
+    index.db.close()
+
+    conn = sqlite3.connect(index_path)
+    # VACUUM may renumber implicit rowids, the full-text index relies on them
+    columns = {row[1]: row[5] for row in conn.execute("PRAGMA table_info(chunks)")}
+    assert columns["rowid"] == 1
+    conn.execute("VACUUM")
+    conn.close()
+
+    index = DocumentIndex(index_path)
+    assert index.search("zebra") == [("b0", "second document zebra")]
+    assert index.search("first") == []
+    index.db.close()
+
+
+def test_rrf_favours_items_ranked_by_both_retrievers():
+    scores = reciprocal_rank_fusion([["a", "b", "c"], ["c", "d", "a"]], k=60)
+
+    assert scores["a"] == pytest.approx(1 / 61 + 1 / 63)
+    assert scores["d"] == pytest.approx(1 / 62)
+    assert sorted(scores, key=scores.__getitem__, reverse=True) == [
+        "a",
+        "c",
+        "b",
+        "d",
+    ]
+    assert reciprocal_rank_fusion([[], []]) == {}
@@ -0,0 +1,112 @@
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from open_terminalui.document_manager import DocumentManager
+from open_terminalui.embeddings import Embedder, text_hash
+from open_terminalui.vector_store import VectorStore
+
+
+class CountingEmbeddingFunction:
+    """Embeds texts by their length, recording every text it's given"""
+
+    def __init__(self):
+        self.texts: List[str] = []
+
+    def __call__(self, input: List[str]) -> List[List[float]]:
+        self.texts += input
+        return [[float(len(text)), 1.0] for text in input]
+
+
+@pytest.fixture
+def embedding_function():
+    return CountingEmbeddingFunction()
+
+
+@pytest.fixture
+def doc_manager(tmp_path, embedding_function, monkeypatch):
+    vector_store = VectorStore(
+        str(tmp_path / "chroma_db"), Embedder(embedding_function, "counting")
+    )
+    doc_manager = DocumentManager(
+        vector_store=vector_store, index_path=str(tmp_path / "documents.db")
+    )
+    # Each line of the file is a chunk, instead of extracting a real PDF
+    monkeypatch.setattr(
+        doc_manager,
+        "_iter_chunks",
+        lambda file_path: iter(Path(file_path).read_text().splitlines()),
+    )
+    yield doc_manager
+    doc_manager.index.db.close()
+
+
+def write(tmp_path, name: str, *chunks: str) -> str:
+    path = tmp_path / name
+    path.write_text("\n".join(chunks))
+    return str(path)
+
+
+def stored_ids(doc_manager: DocumentManager) -> set[str]:
+    return set(doc_manager.collection.get()["ids"])
+
+
+def test_chunks_are_identified_by_their_text(tmp_path, doc_manager):
+    path = write(tmp_path, "a.pdf", "intro", "body", "intro")
+
+    assert doc_manager.add_document(path)[0]
+
+    assert stored_ids(doc_manager) == {text_hash("intro"), text_hash("body")}
+    assert doc_manager.list_documents()[0].chunk_count == 3
+
+
+def test_shared_chunks_are_embedded_once(tmp_path, doc_manager, embedding_function):
+    doc_manager.add_document(write(tmp_path, "a.pdf", "shared", "only in a"))
+    doc_manager.add_document(write(tmp_path, "b.pdf", "shared", "only in b"))
+
+    assert sorted(embedding_function.texts) == ["only in a", "only in b", "shared"]
+
+    # Removing one document keeps the chunks the other still uses
+    doc_manager.remove_document(str(tmp_path / "a.pdf"))
+    assert stored_ids(doc_manager) == {text_hash("shared"), text_hash("only in b")}
+
+
+def test_same_content_at_another_path_isnt_embedded_again(
+    tmp_path, doc_manager, embedding_function
+):
+    first = write(tmp_path, "a.pdf", "one", "two")
+    copy = write(tmp_path, "copy.pdf", "one", "two")
+    doc_manager.add_document(first)
+    embedded = len(embedding_function.texts)
+
+    assert doc_manager.add_document(copy)[0]
+    assert len(embedding_function.texts) == embedded
+    assert len(doc_manager.list_documents()) == 2
+
+    doc_manager.remove_document(first)
+    assert len(stored_ids(doc_manager)) == 2
+    doc_manager.remove_document(copy)
+    assert stored_ids(doc_manager) == set()
+
+
+def test_changed_file_embeds_only_new_chunks(tmp_path, doc_manager, embedding_function):
+    path = write(tmp_path, "a.pdf", "kept", "old")
+    doc_manager.add_document(path)
+
+    write(tmp_path, "a.pdf", "kept", "new")
+    assert doc_manager.add_document(path)[0]
+
+    assert embedding_function.texts == ["kept", "old", "new"]
+    assert stored_ids(doc_manager) == {text_hash("kept"), text_hash("new")}
+    assert [document.file_path for document in doc_manager.list_documents()] == [path]
+
+
+def test_unchanged_file_is_skipped(tmp_path, doc_manager):
+    path = write(tmp_path, "a.pdf", "chunk")
+    doc_manager.add_document(path)
+
+    added, message = doc_manager.add_document(path)
+
+    assert not added
+    assert "already exists" in message
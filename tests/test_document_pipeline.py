@@ -0,0 +1,69 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from open_terminalui import document_pipeline
+from open_terminalui.document_pipeline import iter_batches, iter_chunks, iter_pages
+
+
+def chunk_text(text: str, chunk_size: int = 500, overlap: int = 50) -> list[str]:
+    """How documents were chunked before ingestion was streamed"""
+    words = text.split()
+    chunks = []
+
+    for i in range(0, len(words), chunk_size - overlap):
+        chunk = " ".join(words[i : i + chunk_size])
+        if chunk:
+            chunks.append(chunk)
+
+    return chunks
+
+
+def split_into_pages(words: list[str], rng: random.Random) -> list[str]:
+    pages = []
+    while words:
+        size = rng.randint(0, 300)
+        pages.append("\n".join(words[:size]) + "\n")
+        words = words[size:]
+    return pages
+
+
+@pytest.mark.parametrize("word_count", [0, 1, 449, 450, 500, 501, 950, 1234, 5000])
+def test_chunks_match_chunking_the_whole_text(word_count):
+    rng = random.Random(word_count)
+    words = [f"w{i}" for i in range(word_count)]
+    pages = split_into_pages(words, rng)
+
+    assert list(iter_chunks(pages)) == chunk_text("\n".join(pages))
+    assert list(iter_chunks(pages, chunk_size=10, overlap=3)) == chunk_text(
+        "\n".join(pages), chunk_size=10, overlap=3
+    )
+
+
+def test_batches_keep_order():
+    batches = list(iter_batches((str(i) for i in range(7)), 3))
+
+    assert batches == [["0", "1", "2"], ["3", "4", "5"], ["6"]]
+    assert list(iter_batches([], 3)) == []
+
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_pages_are_yielded_in_order(monkeypatch, workers):
+    monkeypatch.setattr(document_pipeline, "count_pages", lambda file_path: 21)
+    monkeypatch.setattr(
+        document_pipeline,
+        "extract_pages",
+        lambda file_path, start, stop: [f"page {i}" for i in range(start, stop)],
+    )
+
+    if workers is None:
+        pages = list(iter_pages("doc.pdf", pages_per_task=4))
+    else:
+        # Threads stand in for the process pool, the ordering logic is the same
+        with ThreadPoolExecutor(workers) as executor:
+            pages = list(
+                iter_pages("doc.pdf", executor, pages_per_task=4, max_pending=2)
+            )
+
+    assert pages == [f"page {i}" for i in range(21)]
@@ -0,0 +1,127 @@
+import json
+import threading
+
+import pytest
+
+from open_terminalui._models import Chat, Message
+from open_terminalui.chat_manager import ChatManager
+from open_terminalui.memory_indexer import MemoryIndexer
+
+
+class FakeMemoryManager:
+    """Records the chats it's asked to index, failing the first `failures` times"""
+
+    def __init__(self, failures: int = 0):
+        self.failures = failures
+        self.indexed: list[int] = []
+        self.done = threading.Event()
+
+    def save_chat(self, chat: Chat, idle: threading.Event | None = None) -> int:
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("Ollama is not running")
+        assert chat.id is not None
+        self.indexed.append(chat.id)
+        self.done.set()
+        return len(chat.messages)
+
+
+@pytest.fixture
+def chat_manager(tmp_path):
+    chat_manager = ChatManager(str(tmp_path / "chats.db"))
+    yield chat_manager
+    chat_manager.close()
+
+
+@pytest.fixture
+def queue_path(tmp_path):
+    return str(tmp_path / "memory_queue.json")
+
+
+def save_chat(chat_manager: ChatManager) -> int:
+    chat = Chat.create_unsaved("Chat")
+    chat.messages.append(Message(role="user", content="hello"))
+    chat_manager.save_chat(chat)
+    assert chat.id is not None
+    return chat.id
+
+
+def pending_on_disk(queue_path: str) -> list[int]:
+    with open(queue_path) as f:
+        return json.load(f)
+
+
+def test_pending_jobs_survive_a_restart(chat_manager, queue_path):
+    memory_manager = FakeMemoryManager()
+    chat_id = save_chat(chat_manager)
+
+    indexer = MemoryIndexer(chat_manager, lambda: memory_manager, queue_path)
+    assert indexer.enqueue(chat_id)
+    # Never started, as if the app exited before the job ran
+    assert pending_on_disk(queue_path) == [chat_id]
+
+    restarted = MemoryIndexer(
+        chat_manager, lambda: memory_manager, queue_path, debounce=0
+    )
+    restarted.start()
+    assert memory_manager.done.wait(5)
+    restarted.stop()
+
+    assert memory_manager.indexed == [chat_id]
+    assert pending_on_disk(queue_path) == []
+
+
+def test_saving_again_indexes_once(chat_manager, queue_path):
+    memory_manager = FakeMemoryManager()
+    chat_id = save_chat(chat_manager)
+    indexer = MemoryIndexer(
+        chat_manager, lambda: memory_manager, queue_path, debounce=0.1
+    )
+    indexer.start()
+
+    for _ in range(3):
+        indexer.enqueue(chat_id)
+    assert memory_manager.done.wait(5)
+    indexer.stop()
+
+    assert memory_manager.indexed == [chat_id]
+
+
+def test_failed_job_is_retried(chat_manager, queue_path):
+    memory_manager = FakeMemoryManager(failures=1)
+    chat_id = save_chat(chat_manager)
+    indexer = MemoryIndexer(
+        chat_manager,
+        lambda: memory_manager,
+        queue_path,
+        debounce=0,
+        retry_delay=0.1,
+    )
+    indexer.start()
+
+    indexer.enqueue(chat_id)
+    assert memory_manager.done.wait(5)
+    indexer.stop()
+
+    assert memory_manager.indexed == [chat_id]
+
+
+def test_full_queue_rejects_new_chats(chat_manager, queue_path):
+    indexer = MemoryIndexer(chat_manager, FakeMemoryManager, queue_path, max_pending=2)
+
+    assert indexer.enqueue(1)
+    assert indexer.enqueue(2)
+    assert not indexer.enqueue(3)
+    # A chat already waiting is only pushed back
+    assert indexer.enqueue(1)
+    assert pending_on_disk(queue_path) == [1, 2]
+
+
+def test_discarded_job_is_removed_from_disk(chat_manager, queue_path):
+    indexer = MemoryIndexer(chat_manager, FakeMemoryManager, queue_path)
+    indexer.enqueue(1)
+    indexer.enqueue(2)
+
+    indexer.discard(1)
+
+    assert pending_on_disk(queue_path) == [2]